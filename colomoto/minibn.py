@@ -1,18 +1,32 @@
 
+from collections import OrderedDict
 from collections.abc import Hashable
+from concurrent.futures import ProcessPoolExecutor
+import bisect
 import copy
 import hashlib
+import io
 import itertools
+import json
+import math
+import multiprocessing
+import operator
 import os
+import queue
 import random
 import re
+import signal
 import sys
 import tempfile
+import time
 import unicodedata
+import weakref
 
 import networkx as nx
+import numpy as np
+import pandas as pd
 
-from colomoto.types import HypercubeCollection
+from colomoto.types import Hypercube, HypercubeCollection, State
 from colomoto_jupyter import import_colomoto_tool
 from colomoto_jupyter.io import ensure_localfile
 from colomoto_jupyter.sessionfiles import new_output_file
@@ -42,19 +56,207 @@ class _FALSE(bpy._FALSE):
 def is_constant(f):
     return isinstance(f, (bpy._TRUE,bpy._FALSE, bool))
 
-class BaseNetwork(dict):
-    def __init__(self, data=None, Symbol_class=boolean.Symbol,
-            allowed_in_name=('.','_',':','-'), **kwargs):
-        super().__init__()
-        self.ba = boolean.BooleanAlgebra(NOT_class=NOT,
+class ParseError(boolean.ParseError):
+    """
+    Syntax error in a Boolean expression, optionally located at line `lineno`
+    of the parsed data.
+    """
+    def __init__(self, message, token_string="", position=-1, lineno=None):
+        super().__init__(token_string=token_string, position=position)
+        self.message = message
+        self.lineno = lineno
+
+    def __str__(self):
+        msg = self.message
+        if self.token_string:
+            msg = f"{msg} '{self.token_string}' at position {self.position}"
+        if self.lineno is not None:
+            msg = f"line {self.lineno}: {msg}"
+        return msg
+
+class ExpressionParser(object):
+    """
+    Fast parser for the expressions of the bnet/mnet formats.
+
+    Produces the same expressions as `BooleanAlgebra.parse` (same operators
+    and precedences, same flattening of operator chains), using a
+    precompiled tokenizer and a table interning the symbols.
+    """
+    _KEYWORDS = {"and": "&", "or": "|", "not": "!",
+                 "1": "1", "true": "1",
+                 "0": "0", "false": "0", "none": "0"}
+    _OPERATORS = {"&": "&", "*": "&", "|": "|", "+": "|", "!": "!", "~": "!",
+                  "(": "(", "[": "(", ")": ")", "]": ")"}
+
+    def __init__(self, ba):
+        self.ba = ba
+        self.symbols = {}
+        self.expressions = weakref.WeakValueDictionary()
+        extra = "".join(re.escape(c) for c in ba.allowed_in_token)
+        symbol = rf"\w(?:[^\W_]|[{extra}])*" if extra else r"\w[^\W_]*"
+        self._re_token = re.compile(rf"\s*(?:({symbol})|(\S))")
+
+    def symbol(self, name):
+        """
+        Returns the interned symbol `name`
+        """
+        s = self.symbols.get(name)
+        if s is None:
+            s = self.symbols[name] = self.ba.Symbol(name)
+        return s
+
+    def make(self, cls, *args):
+        """
+        Returns the hash-consed expression `cls(*args)`, where `args` are
+        hash-consed expressions.
+        """
+        key = (cls,) + tuple(map(id, args))
+        expr = self.expressions.get(key)
+        if expr is None:
+            expr = self.expressions[key] = cls(*args)
+        return expr
+
+    def tokenize(self, text):
+        """
+        Returns the list of (kind, token) of the string `text`
+        """
+        tokens = []
+        for word, other in self._re_token.findall(text):
+            if word:
+                tokens.append((self._KEYWORDS.get(word.lower(), "s"), word))
+            else:
+                tokens.append((self._OPERATORS.get(other), other))
+        return tokens
+
+    def parse(self, text, lineno=None):
+        """
+        Returns the expression encoded by the string `text`.
+        Raises :py:class:`.ParseError` on syntax errors.
+        """
+        tokens = self.tokenize(text)
+        try:
+            if not tokens:
+                raise ParseError("Empty expression")
+            expr = self._parse(tokens)
+        except ParseError as e:
+            # during parsing, positions are indexes of tokens
+            if e.position >= 0:
+                e.position = [m.start(m.lastindex) for m in
+                        self._re_token.finditer(text)][e.position]
+            e.lineno = lineno
+            raise
+        return expr
+
+    def _unexpected(self, tokens, i):
+        kind, tok = tokens[i]
+        raise ParseError("Unknown token" if kind is None else
+                            "Unexpected token", tok, i)
+
+    def _parse(self, tokens):
+        """
+        Iterative parsing of `tokens` (no recursion on nested parentheses).
+        `stack` holds, for each open parenthesis, the arguments of the
+        enclosing disjunction and conjunction, the number of negations in
+        front of the parenthesis, and its index.
+        """
+        stack = []
+        or_args, and_args, nots = [], [], 0
+        i = 0
+        n = len(tokens)
+        while True:
+            while i < n and tokens[i][0] == "!":
+                nots += 1
+                i += 1
+            if i >= n:
+                raise ParseError("Unexpected end of expression")
+            kind, tok = tokens[i]
+            if kind == "(":
+                stack.append((or_args, and_args, nots, i))
+                or_args, and_args, nots = [], [], 0
+                i += 1
+                continue
+            if kind == "s":
+                expr = self.symbol(tok)
+            elif kind == "1":
+                expr = self.ba.TRUE
+            elif kind == "0":
+                expr = self.ba.FALSE
+            else:
+                self._unexpected(tokens, i)
+            i += 1
+            while True:
+                for _ in range(nots):
+                    expr = self.make(self.ba.NOT, expr)
+                nots = 0
+                and_args.append(expr)
+                if i < n and tokens[i][0] == "&":
+                    i += 1
+                    break
+                expr = and_args[0] if len(and_args) == 1 else \
+                        self.make(self.ba.AND, *and_args)
+                and_args = []
+                or_args.append(expr)
+                if i < n and tokens[i][0] == "|":
+                    i += 1
+                    break
+                expr = or_args[0] if len(or_args) == 1 else \
+                        self.make(self.ba.OR, *or_args)
+                if not stack:
+                    if i < n:
+                        self._unexpected(tokens, i)
+                    return expr
+                or_args, and_args, nots, j = stack.pop()
+                if i >= n:
+                    raise ParseError("Unbalanced parenthesis", tokens[j][1], j)
+                if tokens[i][0] != ")":
+                    self._unexpected(tokens, i)
+                i += 1
+
+class NetworkAlgebra(boolean.BooleanAlgebra):
+    """
+    Boolean algebra of networks. Its symbols are interned and the expressions
+    it parses are hash-consed, so that networks sharing the same algebra
+    (see the `ba` argument of :py:class:`.BaseNetwork`) share their
+    structure.
+    """
+    def __init__(self, Symbol_class=boolean.Symbol,
+            allowed_in_token=('.','_',':','-')):
+        super().__init__(NOT_class=NOT,
             TRUE_class=_TRUE,
             FALSE_class=_FALSE,
             Symbol_class=Symbol_class,
-            allowed_in_token=allowed_in_name)
+            allowed_in_token=allowed_in_token)
+        self.parser = ExpressionParser(self)
+
+    def parse(self, expr, simplify=False):
+        if isinstance(expr, str) and not simplify:
+            return self.parser.parse(expr)
+        return super().parse(expr, simplify=simplify)
+
+    def symbols(self, *names):
+        return tuple(map(self.parser.symbol, names))
+
+    def __reduce__(self):
+        return (self.__class__, (self.Symbol, self.allowed_in_token))
+
+class BaseNetwork(dict):
+    def __init__(self, data=None, Symbol_class=boolean.Symbol,
+            allowed_in_name=('.','_',':','-'), ba=None, **kwargs):
+        """
+        The Boolean algebra `ba` of another network (of the same class) can
+        be given to share symbols and expressions with it.
+        """
+        super().__init__()
+        if ba is None:
+            ba = NetworkAlgebra(Symbol_class=Symbol_class,
+                    allowed_in_token=allowed_in_name)
+        elif not isinstance(ba, NetworkAlgebra) or ba.Symbol is not Symbol_class:
+            raise TypeError("Incompatible Boolean algebra")
+        self.ba = ba
         if data:
             if isinstance(data, str):
                 if "\n" in data or not os.path.exists(data):
-                    self.import_data(data.splitlines())
+                    self.import_data(io.StringIO(data))
                 else:
                     with open(data) as fp:
                         self.import_data(fp)
@@ -121,6 +323,9 @@ class BaseNetwork(dict):
     def vars(self, *names):
         return self.ba.symbols(*names)
 
+    def _parse(self, text, lineno=None):
+        return self.ba.parser.parse(text, lineno)
+
     def _autokey(self, a):
         if isinstance(a, self.ba.Symbol):
             a = a.obj
@@ -131,13 +336,17 @@ class BaseNetwork(dict):
             return self.ba.TRUE if expr else self.ba.FALSE
         elif isinstance(expr, int):
             return self.ba.TRUE if expr > 0 else self.ba.FALSE
+        elif isinstance(expr, bpy._TRUE):
+            return self.ba.TRUE
+        elif isinstance(expr, bpy._FALSE):
+            return self.ba.FALSE
         return expr
 
     def _normalize_tr(self, tr):
         ntr = {}
         for k, v in tr.items():
             if isinstance(v, str):
-                v = self.ba.parse(v)
+                v = self._parse(v)
             if not isinstance(k, self.ba.Symbol):
                 k = self.v(k)
             ntr[k] = self._autobool(v)
@@ -146,6 +355,72 @@ class BaseNetwork(dict):
     def __call__(self, cfg):
         return {a: int(self[a](**cfg)) for a in self}
 
+    _compiled = None
+    _compile_error = None
+    _caches = None
+    _rdeps = None
+    _rdeps_pending = None
+    _version = 0
+
+    def _invalidate(self, a):
+        """
+        Called whenever the function of node `a` is modified or removed.
+        """
+        self._compiled = None
+        self._compile_error = None
+        self._version += 1
+        if self._rdeps is not None:
+            if a not in self._rdeps_pending and dict.__contains__(self, a):
+                for b in self.regulators(a):
+                    targets = self._rdeps[b]
+                    targets.discard(a)
+                    if not targets:
+                        del self._rdeps[b]
+            self._rdeps_pending.add(a)
+
+    def _cached(self, name, a, compute):
+        """
+        Returns `compute(f)` where `f` is the function of node `a`.
+        The result is memoized until the function of `a` changes.
+        """
+        f = self[a]
+        if self._caches is None:
+            self._caches = {}
+        cache = self._caches.setdefault(name, {})
+        entry = cache.get(a)
+        if entry is None or entry[0] is not f:
+            entry = (f, compute(f))
+            cache[a] = entry
+        return entry[1]
+
+    def _function_symbols(self, f):
+        if isinstance(f, boolean.Expression):
+            return frozenset(s.obj for s in f.get_symbols())
+        return frozenset()
+
+    def regulators(self, a):
+        """
+        Returns the set of nodes (or symbols) occurring in the function of
+        node `a`.
+        """
+        return self._cached("symbols", a, self._function_symbols)
+
+    def targets(self, b):
+        """
+        Returns the set of nodes whose function refers to the node (or
+        symbol) `b`.
+        """
+        if self._rdeps is None:
+            self._rdeps = {}
+            self._rdeps_pending = set(self)
+        if self._rdeps_pending:
+            for a in self._rdeps_pending:
+                if a in self:
+                    for c in self.regulators(a):
+                        self._rdeps.setdefault(c, set()).add(a)
+            self._rdeps_pending = set()
+        return set(self._rdeps.get(self._autokey(b), ()))
+
     def zero(self):
         return {a: 0 for a in self}
 
@@ -155,18 +430,65 @@ class BaseNetwork(dict):
 
     def __setitem__(self, a, f):
         if isinstance(f, str):
-            f = self.ba.parse(f)
+            f = self._parse(f)
         f = self._autobool(f)
-        return super().__setitem__(self._autokey(a), f)
+        a = self._autokey(a)
+        self._invalidate(a)
+        return super().__setitem__(a, f)
 
     def __getitem__(self, a):
         return super().__getitem__(self._autokey(a))
 
+    def __delitem__(self, a):
+        a = self._autokey(a)
+        self._invalidate(a)
+        return super().__delitem__(a)
+
+    def pop(self, a, *default):
+        a = self._autokey(a)
+        self._invalidate(a)
+        return super().pop(a, *default)
+
+    def popitem(self):
+        if not self:
+            raise KeyError("popitem(): network is empty")
+        a = next(reversed(self.keys()))
+        return a, self.pop(a)
+
+    def setdefault(self, a, f=None):
+        if self._autokey(a) not in self:
+            self[a] = f
+        return self[a]
+
+    def update(self, *args, **kwargs):
+        for a, f in dict(*args, **kwargs).items():
+            self[a] = f
+
+    def clear(self):
+        for a in list(self):
+            self._invalidate(a)
+        super().clear()
+
     def copy(self):
         bn = copy.copy(self)
         bn.ba = self.ba
         return bn
 
+    def __copy__(self):
+        bn = self.__class__.__new__(self.__class__)
+        bn.__dict__.update(self.__dict__)
+        if self._caches is not None:
+            bn._caches = {k: dict(c) for k, c in self._caches.items()}
+        bn._rdeps = bn._rdeps_pending = None
+        dict.update(bn, self)
+        return bn
+
+    def __reduce__(self):
+        state = {k: v for k, v in self.__dict__.items()
+                    if k not in ("ba", "_caches", "_rdeps", "_rdeps_pending")}
+        return (_restore_network, (self.__class__, self.ba,
+                                    list(self.items()), state))
+
     def _quick_rename(self, name, newname):
         if newname == name:
             return
@@ -176,7 +498,7 @@ class BaseNetwork(dict):
 
     def rename(self, a, b):
         self._quick_rename(a, b)
-        for n in self:
+        for n in self.targets(a):
             self.rewrite(n, {a:b}, simplify=False)
 
     def sanitize_names(self):
@@ -201,10 +523,129 @@ class BaseNetwork(dict):
                 tr[name] = sname
                 btr[self.v(name)] = self.v(sname)
         if btr:
-            for a in self:
-                self.rewrite(a, btr, simplify=False)
+            for a in set().union(*map(self.targets, tr)):
+                self.rewrite(a, {self.v(b): btr[self.v(b)]
+                                    for b in self.regulators(a) if b in tr},
+                            simplify=False)
         return tr
 
+    def influences(self, a):
+        """
+        Returns the set of pairs `(b, sign)` of the nodes `b` influencing node
+        `a`, with `sign` being 1 for a positive influence and -1 for a
+        negative one.
+        """
+        return self._cached("influences", a, self._function_influences)
+
+    def influence_graph(self):
+        ig = nx.MultiDiGraph()
+        ig.add_nodes_from(self)
+        for a in self:
+            for b, sign in self.influences(a):
+                ig.add_edge(b, a, sign=sign, label="+" if sign > 0 else "-")
+        return ig
+
+    def dynamics(self, update_mode="asynchronous", init=None, loops=None,
+            encoding="str", backend="networkx", processes=None):
+        """
+        Returns a directed graph (`networkx.DiGraph` object) of the dynamics
+        with the `update_mode`.
+
+        :param update_mode: either `"asynchronous"` (or equivalently
+            `"fully-asynchronous"`), `"synchronous"` (or equivalently
+            `"parallel"`), `"general"`.
+            Alternatively, it can be a function returning an
+            :class:`.UpdateModeDynamics` object.
+        :param dict[str,int] init: Optional initial state from which the
+            dynamics is computed.
+        :param encoding: identifiers of states in the graph, either `"str"`
+            (string of the node values) or `"int"` (integer encoding, see
+            :py:class:`.UpdateModeDynamics`).
+        :param backend: either `"networkx"` (returns a `networkx.DiGraph`
+            object) or `"csr"` (returns a compact
+            :py:class:`.StateTransitionGraph` object, which can be converted
+            to networkx with its `to_networkx` method) or `"lazy"` (returns a
+            :py:class:`.LazyStateTransitionGraph` object computing the
+            transitions on demand; `init` is then ignored).
+        :param int processes: number of worker processes used to compute the
+            dynamics.
+        """
+        update_mode = self._update_mode_dynamics(update_mode, loops)
+        if init:
+            return update_mode.partial_dynamics(init, encoding=encoding,
+                    backend=backend, processes=processes)
+        else:
+            return update_mode.dynamics(encoding=encoding, backend=backend,
+                    processes=processes)
+
+    def _update_mode_dynamics(self, update_mode, loops=None):
+        if isinstance(update_mode, str):
+            if update_mode in ["asynchronous", "fully-asynchronous"]:
+                update_mode = FullyAsynchronousDynamics
+            elif update_mode == "general":
+                update_mode = GeneralAsynchronousDynamics
+            elif update_mode in ["synchronous", "parallel"]:
+                update_mode = SynchronousDynamics
+            else:
+                raise ValueError(f"Unknown update mode {update_mode}")
+        opts = {}
+        if loops is not None:
+            opts["loops"] = loops
+        return update_mode(self, **opts)
+
+    def attractors(self, update_mode="asynchronous", init=None):
+        """
+        Returns the list of the attractors of the dynamics with the
+        `update_mode`, each attractor being either a :py:class:`.State` object
+        (fixed point) or a :py:class:`.HypercubeCollection` object (states of
+        a cyclic attractor).
+
+        The terminal strongly connected components are computed on the fly,
+        without building the graph of the dynamics.
+
+        :param update_mode: see :py:meth:`.dynamics`
+        :param dict[str,int] init: Optional initial state: only the
+            attractors reachable from it are returned.
+        """
+        return self._update_mode_dynamics(update_mode).attractors(init)
+
+    def basins(self, update_mode="asynchronous", labels=False,
+            processes=None):
+        """
+        Returns the pair `(attractors, sizes)` of the attractors of the
+        dynamics with the `update_mode` and of the number of states from
+        which each attractor is reachable (see
+        :py:meth:`.StateTransitionGraph.basins`).
+
+        :param update_mode: see :py:meth:`.dynamics`
+        :param bool labels: if `True`, returns instead the triplet
+            `(attractors, sizes, labels)` where `labels[s]` is the index of the
+            only attractor reachable from the state encoded by `s`, or `-1` if
+            several are reachable.
+        :param int processes: number of worker processes used to compute the
+            dynamics.
+        """
+        return self._update_mode_dynamics(update_mode).basins(labels,
+                    processes=processes)
+
+    def reachable(self, init, target, update_mode="asynchronous",
+            witness=False):
+        """
+        Returns whether a state matching `target` is reachable from the
+        configuration `init` with the `update_mode`, stopping the exploration
+        as soon as one is found.
+
+        :param target: a configuration, a partial configuration, a
+            :py:class:`.Hypercube`, or a list of them (e.g.,
+            :py:class:`.HypercubeCollection`).
+        :param update_mode: see :py:meth:`.dynamics`
+        :param bool witness: if `True`, returns instead a shortest path (list
+            of configurations) from `init` to a state matching `target`, or
+            `None` if there is none.
+        """
+        return self._update_mode_dynamics(update_mode).reachable(init,
+                    target, witness=witness)
+
     biolqm_format = None
     def to_biolqm(self):
         bnfile = new_output_file(ext=self.biolqm_format)
@@ -214,45 +655,126 @@ class BaseNetwork(dict):
         return biolqm.load(bnfile)
 
 
-def simplify_dnf(ba, f):
-    def is_wellformed_dnf(f):
-        pos, neg = set(), set()
-        def is_lit(f):
-            if isinstance(f, ba.Symbol):
-                pos.add(f.obj)
-                return True
-            elif isinstance(f, ba.NOT) \
-                    and isinstance(f.args[0], ba.Symbol):
-                neg.add(f.args[0].obj)
-                return True
-            return False
+def _restore_network(celf, ba, items, state):
+    """
+    Unpickling of :py:class:`.BaseNetwork` objects: the Boolean algebra is
+    re-created in the current process, once per pickle.
+    """
+    bn = celf(ba=ba)
+    bn.__dict__.update(state)
+    dict.update(bn, [(a, bn._autobool(f)) for a, f in items])
+    return bn
 
-        def is_clause(f):
-            if is_lit(f):
-                return True
-            if isinstance(f, ba.AND):
-                for g in f.args:
-                    if not is_lit(g):
-                        return False
-                return True
-            return False
+def _is_suspect_dnf(ba, f):
+    """
+    Returns True if `f` is in DNF and has literals with opposite signs
+    """
+    pos, neg = set(), set()
+    def is_lit(f):
+        if isinstance(f, ba.Symbol):
+            pos.add(f.obj)
+            return True
+        elif isinstance(f, ba.NOT) \
+                and isinstance(f.args[0], ba.Symbol):
+            neg.add(f.args[0].obj)
+            return True
+        return False
 
-        if f is ba.TRUE or f is ba.FALSE:
-            return True, set()
-        if is_clause(f):
-            return True, pos.intersection(neg)
-        if isinstance(f, ba.OR):
+    def is_clause(f):
+        if is_lit(f):
+            return True
+        if isinstance(f, ba.AND):
             for g in f.args:
-                if not is_clause(g):
-                    return False, None
-            return True, pos.intersection(neg)
-        return False, None
+                if not is_lit(g):
+                    return False
+            return True
+        return False
+
+    if f is ba.TRUE or f is ba.FALSE:
+        return False
+    if is_clause(f):
+        return bool(pos.intersection(neg))
+    if isinstance(f, ba.OR):
+        for g in f.args:
+            if not is_clause(g):
+                return False
+        return bool(pos.intersection(neg))
+    return False
 
-    is_dnf, suspects = is_wellformed_dnf(f)
-    if is_dnf and suspects:
+def simplify_dnf(ba, f):
+    if _is_suspect_dnf(ba, f):
         return ba.dnf(ba.cnf(f))
     return f
 
+def _simplify_dnf_task(ba, f, timeout=None):
+    """
+    :py:func:`.simplify_dnf` run by a worker process, returning `None` if it
+    takes more than `timeout` seconds (on platforms supporting interval
+    timers).
+    """
+    if not timeout or not hasattr(signal, "setitimer"):
+        return simplify_dnf(ba, f)
+    def interrupt(signum, frame):
+        raise TimeoutError
+    handler = signal.signal(signal.SIGALRM, interrupt)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return simplify_dnf(ba, f)
+    except TimeoutError:
+        return None
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, handler)
+
+def _expr_key(ba, f):
+    """
+    Hashable representation of the structure of the expression `f`,
+    independent of the Boolean algebra and of the identity of objects
+    """
+    if isinstance(f, ba.Symbol):
+        return ("s", f.obj)
+    if isinstance(f, bpy._TRUE):
+        return True
+    if isinstance(f, bpy._FALSE):
+        return False
+    if isinstance(f, ba.NOT):
+        return ("!", _expr_key(ba, f.args[0]))
+    if isinstance(f, ba.AND):
+        op = "&"
+    elif isinstance(f, ba.OR):
+        op = "|"
+    else:
+        raise TypeError(f"Unsupported expression {f!r}")
+    return (op,) + tuple([_expr_key(ba, g) for g in f.args])
+
+def _expr_of_key(ba, key):
+    """
+    Builds a new expression of `ba` with the structure `key` (see
+    :py:func:`._expr_key`)
+    """
+    if key is True:
+        return ba.TRUE
+    if key is False:
+        return ba.FALSE
+    if key[0] == "s":
+        return ba.parser.symbol(key[1])
+    if key[0] == "!":
+        return ba.NOT(_expr_of_key(ba, key[1]))
+    cls = ba.AND if key[0] == "&" else ba.OR
+    return cls(*[_expr_of_key(ba, k) for k in key[1:]])
+
+_simplified = {}
+_simplified_size = 2**16
+
+def _memoize_simplified(ba, key, f):
+    """
+    Memoizes the structure of `f`, as simplified expressions are normalized
+    in place by boolean.py and thus cannot be shared between networks.
+    """
+    if len(_simplified) >= _simplified_size:
+        _simplified.clear()
+    _simplified[key] = _expr_key(ba, f)
+
 def struct_of_dnf(ba, f, container=frozenset, sort=False):
     def make_lit(l):
         if isinstance(l, ba.NOT):
@@ -277,6 +799,388 @@ def struct_of_dnf(ba, f, container=frozenset, sort=False):
     clauses = map(make_clause, clauses)
     return container(sorted(clauses) if sort else clauses)
 
+def _level_weights(levels):
+    """
+    Weights of the nodes of maximum levels `levels` in the mixed radix
+    encoding of configurations, as Python integers (which do not overflow)
+    """
+    return tuple(itertools.accumulate([1] + [m+1 for m in levels[:-1]],
+                                      operator.mul)) if levels else ()
+
+_PYOPS = {"true": "1", "false": "0", "not": "1^{}",
+            "and": " and ", "or": " or "}
+_NPOPS = {"true": "T", "false": "F", "not": "~{}",
+            "and": " & ", "or": " | "}
+
+def _pyexpr(ba, f, var, ops=_PYOPS, prec=4):
+    """
+    Python source code evaluating the Boolean expression `f`, where `var` maps
+    a symbol to the code of its value.
+    By default, the code operates on 0/1 integers; with `ops=_NPOPS`, it
+    operates on NumPy Boolean arrays.
+
+    Parentheses are only added around sub-expressions whose operator binds
+    less tightly than the one of their context, of precedence `prec` (1 for
+    or, 2 for and, 3 for not, 4 for atoms); by default, the code is an atom.
+    """
+    if f is ba.TRUE or isinstance(f, bpy._TRUE):
+        return ops["true"]
+    if f is ba.FALSE or isinstance(f, bpy._FALSE):
+        return ops["false"]
+    if isinstance(f, ba.Symbol):
+        return var(f.obj)
+    if isinstance(f, ba.NOT):
+        code = ops["not"].format(_pyexpr(ba, f.args[0], var, ops, 3))
+        return f"({code})" if prec > 3 else code
+    if isinstance(f, ba.AND):
+        op, level = ops["and"], 2
+    elif isinstance(f, ba.OR):
+        op, level = ops["or"], 1
+    else:
+        raise TypeError(f"Unsupported expression {f!r}")
+    code = op.join([_pyexpr(ba, g, var, ops, level) for g in f.args])
+    return f"({code})" if prec > level else code
+
+# errors of the compilation of a network: unknown symbols, or functions too
+# deeply nested for the Python parser (which raises MemoryError when its stack
+# overflows) and compiler
+_COMPILE_ERRORS = (ValueError, SyntaxError, RecursionError, MemoryError)
+
+_VAR, _NOT, _AND, _OR, _CST = range(5)
+
+def _expr_tree(ba, f, index):
+    """
+    Converts the Boolean expression `f` to nested tuples, where symbols are
+    replaced by their position given by `index`
+    """
+    if f is ba.TRUE or isinstance(f, bpy._TRUE):
+        return (_CST, 1)
+    if f is ba.FALSE or isinstance(f, bpy._FALSE):
+        return (_CST, 0)
+    if isinstance(f, ba.Symbol):
+        if f.obj not in index:
+            raise ValueError(f"Unknown node {f.obj!r}")
+        return (_VAR, index[f.obj])
+    if isinstance(f, ba.NOT):
+        return (_NOT, _expr_tree(ba, f.args[0], index))
+    if isinstance(f, ba.AND):
+        op = _AND
+    elif isinstance(f, ba.OR):
+        op = _OR
+    else:
+        raise TypeError(f"Unsupported expression {f!r}")
+    return (op, tuple(_expr_tree(ba, g, index) for g in f.args))
+
+def _kleene_code(t):
+    """
+    Python source code of the conditions for the expression tree `t` to be
+    necessarily true, and necessarily false, under the partial assignment
+    given by the bit masks `o` (nodes fixed to 1) and `z` (nodes fixed to 0),
+    as pairs `(code, level)` where `level` is the precedence of the outermost
+    operator of `code` (1 for `or`, 2 for `and`, 3 for atoms)
+    """
+    kind = t[0]
+    if kind == _VAR:
+        return (f"o >> {t[1]} & 1", 3), (f"z >> {t[1]} & 1", 3)
+    if kind == _CST:
+        return (("1", 3), ("0", 3)) if t[1] else (("0", 3), ("1", 3))
+    if kind == _NOT:
+        ct, cf = _kleene_code(t[1])
+        return cf, ct
+    def join(op, level, codes):
+        return op.join([f"({c})" if l < level else c for c, l in codes]), level
+    cts, cfs = zip(*map(_kleene_code, t[1]))
+    if kind == _AND:
+        return join(" and ", 2, cts), join(" or ", 1, cfs)
+    return join(" or ", 1, cts), join(" and ", 2, cfs)
+
+def _eval3(t, o, z):
+    """
+    Three-valued (Kleene) evaluation of the expression tree `t` with the
+    partial assignment given by the bit masks `o` and `z` (see
+    :py:func:`._kleene_code`); returns 0, 1, or `None` if undetermined.
+    """
+    kind = t[0]
+    if kind == _VAR:
+        if o >> t[1] & 1:
+            return 1
+        if z >> t[1] & 1:
+            return 0
+        return None
+    if kind == _CST:
+        return t[1]
+    if kind == _NOT:
+        v = _eval3(t[1], o, z)
+        return None if v is None else 1-v
+    absorbing = 0 if kind == _AND else 1
+    res = 1 - absorbing
+    for c in t[1]:
+        v = _eval3(c, o, z)
+        if v == absorbing:
+            return absorbing
+        if v is None:
+            res = None
+    return res
+
+def _force3(t, v, o, z, assigned):
+    """
+    Forces the expression tree `t` to evaluate to `v` by assigning the
+    variables whose value is implied, appended to `assigned`.
+    Returns the new bit masks `(o, z)`, or `None` in case of conflict.
+    """
+    kind = t[0]
+    if kind == _VAR:
+        b = 1 << t[1]
+        if (o if v else z) & b:
+            return o, z
+        if (z if v else o) & b:
+            return None
+        assigned.append(t[1])
+        return (o | b, z) if v else (o, z | b)
+    if kind == _CST:
+        return (o, z) if t[1] == v else None
+    if kind == _NOT:
+        return _force3(t[1], 1-v, o, z, assigned)
+    absorbing = 0 if kind == _AND else 1
+    if v != absorbing:
+        # all the arguments must be non-absorbing
+        for c in t[1]:
+            oz = _force3(c, v, o, z, assigned)
+            if oz is None:
+                return None
+            o, z = oz
+        return o, z
+    # at least one argument must be absorbing
+    free = None
+    for c in t[1]:
+        cv = _eval3(c, o, z)
+        if cv == absorbing:
+            return o, z
+        if cv is None:
+            if free is not None:
+                return o, z
+            free = c
+    if free is None:
+        return None
+    return _force3(free, v, o, z, assigned)
+
+class CompiledBooleanNetwork(object):
+    """
+    Python step functions generated from the node functions of a
+    :class:`.BooleanNetwork`, as returned by :py:meth:`.BooleanNetwork.compile`.
+
+    Configurations are either tuples of 0/1 values, following the order of
+    `nodes`, or integers, where bit `i` is the value of `nodes[i]`.
+    Batches of configurations are NumPy arrays, either of shape `(m, n)`
+    (one configuration per row), or of shape `(m,)` for integer encodings.
+    """
+    def __init__(self, nodes, source, codes=None, base=None):
+        self.nodes = tuple(nodes)
+        self.index = {a: i for i, a in enumerate(self.nodes)}
+        self.source = source
+        self.codes = codes
+        self.base = base
+        namespace = {"np": np, "base": base}
+        exec(compile(source, "<minibn>", "exec"), namespace)
+        self.step = namespace["step"]
+        self.step_int = namespace["step_int"]
+        self.step_batch = namespace["step_batch"]
+        self._weights = np.left_shift(1, np.arange(len(self.nodes),
+                                                    dtype=np.int64))
+        self._flips = None
+
+    flip_ratio = 16
+    """
+    :py:meth:`.update_int` re-evaluates only the targets of the changed nodes
+    when they are at most one `flip_ratio`-th of the nodes, and the whole
+    network otherwise
+    """
+
+    @classmethod
+    def from_network(celf, bn, base=None, unchanged=()):
+        """
+        Compiles the Boolean network `bn`.
+        If `base` is a compiled network having the same nodes, the code of the
+        nodes in `unchanged` is re-used from it; when they are the majority,
+        the step functions call the ones of `base` and only update the other
+        nodes.
+        """
+        nodes = tuple(bn)
+        index = {a: i for i, a in enumerate(nodes)}
+        def var(a):
+            if a not in index:
+                raise ValueError(f"Unknown node {a!r}")
+            node_used.add(index[a])
+            return f"x{index[a]}"
+        if base is None or base.codes is None or base.nodes != nodes:
+            unchanged = ()
+        codes = []
+        changed = []
+        for i, a in enumerate(nodes):
+            if a in unchanged:
+                codes.append(base.codes[i])
+                continue
+            node_used = set()
+            codes.append((_pyexpr(bn.ba, bn[a], var),
+                          _pyexpr(bn.ba, bn[a], var, _NPOPS),
+                          frozenset(node_used)))
+            changed.append(i)
+        n = len(nodes)
+        if unchanged and not changed:
+            return base
+        if unchanged and len(changed) <= n // 2:
+            return celf(nodes, celf._patch_source(codes, changed), codes, base)
+        exprs = [c[0] for c in codes]
+        np_exprs = [c[1] for c in codes]
+        used = set().union(*[c[2] for c in codes])
+        buf = "def step(x):\n"
+        if n:
+            buf += "    {}, = x\n".format(", ".join([f"x{i}" for i in range(n)]))
+        buf += "    return ({})\n".format("".join([f"{e}, " for e in exprs]))
+        buf += "def step_int(s):\n"
+        for i in sorted(used):
+            buf += f"    x{i} = s >> {i} & 1\n"
+        # one statement per node, as a single expression joining thousands
+        # of terms exceeds the recursion limit of the Python compiler
+        buf += "    z = 0\n"
+        for i, e in enumerate(exprs):
+            buf += f"    z |= {e} << {i}\n"
+        buf += "    return z\n"
+        buf += "def step_batch(X):\n"
+        buf += "    T = np.ones(len(X), dtype=bool)\n"
+        buf += "    F = ~T\n"
+        for i in sorted(used):
+            buf += f"    x{i} = X[:, {i}]\n"
+        buf += "    Y = np.empty(X.shape, dtype=bool)\n"
+        for i, e in enumerate(np_exprs):
+            buf += f"    Y[:, {i}] = {e}\n"
+        buf += "    return Y\n"
+        return celf(nodes, buf, codes)
+
+    @staticmethod
+    def _patch_source(codes, changed):
+        """
+        Source of step functions computing the nodes at positions `changed`
+        and delegating the others to the step functions of the base network
+        """
+        used = sorted(set().union(*[codes[i][2] for i in changed]))
+        mask = sum(1 << i for i in changed)
+        buf = "def step(x):\n"
+        buf += "    y = list(base.step(x))\n"
+        for i in used:
+            buf += f"    x{i} = x[{i}]\n"
+        for i in changed:
+            buf += f"    y[{i}] = {codes[i][0]}\n"
+        buf += "    return tuple(y)\n"
+        buf += "def step_int(s):\n"
+        for i in used:
+            buf += f"    x{i} = s >> {i} & 1\n"
+        buf += f"    z = base.step_int(s) & ~{mask}\n"
+        for i in changed:
+            buf += f"    z |= {codes[i][0]} << {i}\n"
+        buf += "    return z\n"
+        buf += "def step_batch(X):\n"
+        buf += "    T = np.ones(len(X), dtype=bool)\n"
+        buf += "    F = ~T\n"
+        for i in used:
+            buf += f"    x{i} = X[:, {i}]\n"
+        buf += "    Y = base.step_batch(X)\n"
+        for i in changed:
+            buf += f"    Y[:, {i}] = {codes[i][1]}\n"
+        buf += "    return Y\n"
+        return buf
+
+    def _flip_functions(self):
+        """
+        Function `flip{j}(s, z)` re-evaluates in `z` the nodes whose function
+        refers to node `j`, from the configuration `s`
+        """
+        if self._flips is None:
+            n = len(self.nodes)
+            targets = [[] for _ in range(n)]
+            for i, (_, _, used) in enumerate(self.codes):
+                for j in used:
+                    targets[j].append(i)
+            buf = ""
+            for j, T in enumerate(targets):
+                used = sorted(set().union(*[self.codes[i][2] for i in T]))
+                buf += f"def flip{j}(s, z):\n"
+                for i in used:
+                    buf += f"    x{i} = s >> {i} & 1\n"
+                buf += "    return z & ~{} | {}\n".format(
+                        sum(1 << i for i in T),
+                        " | ".join([f"{self.codes[i][0]} << {i}" for i in T])
+                            or "0")
+            namespace = {}
+            exec(compile(buf, "<minibn>", "exec"), namespace)
+            self._flips = tuple(namespace[f"flip{j}"] for j in range(n))
+        return self._flips
+
+    def update_int(self, s, z, mask):
+        """
+        Returns the integer encoding of the image of the configuration encoded
+        by `s`, given the image `z` of the configuration `s ^ mask`.
+
+        When few bits are set in `mask` (see :py:attr:`.flip_ratio`), only the
+        targets of the corresponding nodes are re-evaluated.
+        """
+        if self.codes is None or \
+                bin(mask).count("1") * self.flip_ratio > len(self.nodes):
+            return self.step_int(s)
+        flips = self._flip_functions()
+        t = s ^ mask
+        while mask:
+            b = mask & -mask
+            t ^= b
+            z = flips[b.bit_length()-1](t, z)
+            mask ^= b
+        return z
+
+    def __reduce__(self):
+        return (self.__class__, (self.nodes, self.source, self.codes,
+                                    self.base))
+
+    def encode(self, x):
+        """
+        Returns the integer encoding of configuration `x` (`dict`)
+        """
+        s = 0
+        for i, a in enumerate(self.nodes):
+            if x[a]:
+                s |= 1 << i
+        return s
+
+    def decode(self, s):
+        """
+        Returns the configuration (`dict`) encoded by integer `s`
+        """
+        return {a: (s >> i) & 1 for i, a in enumerate(self.nodes)}
+
+    def unpack(self, S):
+        """
+        Returns the `(m, n)` Boolean array of the configurations encoded by the
+        integer array `S`
+        """
+        S = np.asarray(S, dtype=np.int64)
+        return (S[:, None] & self._weights) != 0
+
+    def pack(self, X):
+        """
+        Returns the integer encodings of the rows of the `(m, n)` array `X`
+        """
+        return np.asarray(X, dtype=np.int64) @ self._weights
+
+    def step_int_batch(self, S):
+        """
+        Returns the integer encodings of the images of the configurations
+        encoded by the integer array `S`
+        """
+        return self.pack(self.step_batch(self.unpack(S)))
+
+    def __call__(self, cfg):
+        y = self.step(tuple([cfg[a] for a in self.nodes]))
+        return {a: int(v) for a, v in zip(self.nodes, y)}
+
 class BooleanNetwork(BaseNetwork):
 
     biolqm_format = "bnet"
@@ -293,15 +1197,65 @@ class BooleanNetwork(BaseNetwork):
     def inputs(self):
         return [a for a, f in self.items() if f == self.v(a)]
 
+    def compile(self):
+        """
+        Returns a :class:`.CompiledBooleanNetwork` object gathering all the node
+        functions in Python step functions.
+        The result is cached until a node function is modified.
+
+        Raises `ValueError` if a function refers to a symbol which is not a
+        node of the network, and `SyntaxError`, `RecursionError` or
+        `MemoryError` if a function is too deeply nested for the Python
+        compiler.
+        """
+        if self._compiled is None:
+            if self._compile_error is not None:
+                raise self._compile_error.with_traceback(None)
+            try:
+                self._compiled = self._compile()
+            except _COMPILE_ERRORS as e:
+                self._compile_error = e
+                raise
+        return self._compiled
+
+    def _compile(self):
+        return CompiledBooleanNetwork.from_network(self)
+
+    def __call__(self, cfg):
+        try:
+            compiled = self.compile()
+        except _COMPILE_ERRORS:
+            # fall back to the evaluation of the expressions
+            return super().__call__(cfg)
+        return compiled(cfg)
+
+    def evaluate_batch(self, states):
+        """
+        Returns the images of a batch of configurations.
+
+        :param states: array of shape `(m, n)`, where each row is a
+            configuration of the `n` nodes, in the order of the network.
+        :rtype: `numpy.ndarray` of shape `(m, n)` and of the same `dtype` as
+            `states`.
+        """
+        states = np.asarray(states)
+        if states.ndim != 2 or states.shape[1] != len(self):
+            raise ValueError(f"Expected an array of shape (m, {len(self)})")
+        Y = self.compile().step_batch(states.astype(bool, copy=False))
+        return Y.astype(states.dtype, copy=False)
+
     def import_data(self, data):
         header = None
-        for line in data:
+        for lineno, line in enumerate(data, 1):
             line = line.split("#")[0].strip()
             if not line:
                 continue
             sep = line.find("<-")
             if sep < 0:
-                comma = line.index(",")
+                comma = line.find(",")
+                if comma < 0:
+                    raise ParseError("Missing separator ',' or '<-'",
+                            lineno=lineno)
                 left = line[:comma].strip()
                 right = line[comma+1:].strip()
             else:
@@ -310,21 +1264,53 @@ class BooleanNetwork(BaseNetwork):
             if header is None and (left, right) == ("targets", "factors"):
                 header = True
                 continue
-            self[left] = self.ba.parse(right)
+            self[left] = self._parse(right, lineno)
 
-    def simplify(self, in_place=False, suspect_dnf=True):
+    def simplify(self, in_place=False, suspect_dnf=True, processes=None,
+            timeout=None):
         """
         if in_place, modifies the network in place, otherwise works on a copy
         returns it.
         if suspect_dnf, try harder simplifications for functions that are in DNF and have literals with
         opposite signs in clauses (will make CNF and DNF transformations).
+        if processes, these transformations are computed by as many worker
+        processes, and, if timeout is given, abandoned after that many seconds
+        per node, keeping the function as simplified by boolean.py.
+        Simplified functions are memoized, and re-used for structurally
+        identical functions of any network.
         """
+        if timeout and not processes:
+            raise ValueError("timeout requires worker processes")
         bn = self if in_place else copy.copy(self)
-        for a, f in bn.items():
-            f = f.simplify()
-            if suspect_dnf:
-                f = simplify_dnf(self.ba, f)
-            bn[a] = f
+        executor = ProcessPoolExecutor(processes) \
+                        if suspect_dnf and processes else None
+        pending = []
+        try:
+            for a, f in bn.items():
+                key = (_expr_key(self.ba, f), suspect_dnf)
+                g = _simplified.get(key)
+                if g is not None:
+                    g = _expr_of_key(self.ba, g)
+                else:
+                    g = f.simplify()
+                    if suspect_dnf and _is_suspect_dnf(self.ba, g):
+                        if executor is not None:
+                            future = executor.submit(_simplify_dnf_task,
+                                                    self.ba, g, timeout)
+                            pending.append((a, key, g, future))
+                            continue
+                        g = simplify_dnf(self.ba, g)
+                    _memoize_simplified(self.ba, key, g)
+                bn[a] = g
+            for a, key, g, future in pending:
+                h = future.result()
+                if h is not None:
+                    g = h
+                    _memoize_simplified(self.ba, key, g)
+                bn[a] = g
+        finally:
+            if executor is not None:
+                executor.shutdown()
         return bn if not in_place else None
 
     def as_dnf(self):
@@ -357,37 +1343,114 @@ class BooleanNetwork(BaseNetwork):
         """
         compute a hash for the BN based on its DNF representation
         """
-        D = []
-        for i, f in sorted(self.items()):
+        def node_struct(f):
             if f not in [self.ba.TRUE, self.ba.FALSE]:
                 f = self.ba.dnf(f)
                 if simplify:
                     f = simplify_dnf(self.ba, f)
-            struct = struct_of_dnf(self.ba, f, container=tuple, sort=True)
-            D.append((i,struct))
-        return hashlib.md5(str(D).encode()).hexdigest()
-
-    def influence_graph(self):
-        import networkx as nx
+            return repr(struct_of_dnf(self.ba, f, container=tuple, sort=True))
+        # the per-node DNF structures are memoized (and shared with copies)
+        # until the node function changes; the digest is the one of the
+        # string of the sorted list of (node, structure)
+        cache = "hash_struct_simplified" if simplify else "hash_struct"
+        D = ["({!r}, {})".format(i, self._cached(cache, i, node_struct))
+                for i in sorted(self)]
+        return hashlib.md5("[{}]".format(", ".join(D)).encode()).hexdigest()
+
+    def _function_influences(self, f):
         influences = set()
-        ig = nx.MultiDiGraph()
-        for a, f in self.items():
-            ig.add_node(a)
-            for lit in f.simplify().literalize().get_literals():
-                if isinstance(lit, boolean.NOT):
-                    b = lit.args[0].obj
-                    sign = -1
-                else:
-                    b = lit.obj
-                    sign = 1
-                influences.add((b,a,sign))
-        for (b, a, sign) in influences:
-            ig.add_edge(b, a, sign=sign, label="+" if sign > 0 else "-")
-        return ig
+        for lit in f.simplify().literalize().get_literals():
+            if isinstance(lit, boolean.NOT):
+                influences.add((lit.args[0].obj, -1))
+            else:
+                influences.add((lit.obj, 1))
+        return frozenset(influences)
 
     def constants(self):
         return {i: f for i,f in self.items() if is_constant(f)}
 
+    def fixpoints(self, limit=None):
+        """
+        Returns the list of fixed points (configurations `x` such that
+        `f(x) = x`), as :py:class:`.State` objects.
+
+        The fixed points are enumerated by a backtracking search, branching on
+        nodes following the influence graph (upstream components first), and
+        propagating the constraints `x_i = f_i(x)` after each decision, hence
+        without enumerating the whole state space.
+
+        :param int limit: stop after finding that number of fixed points.
+        """
+        nodes = tuple(self)
+        index = {a: i for i, a in enumerate(nodes)}
+        trees = [_expr_tree(self.ba, self[a], index) for a in nodes]
+        targets = [[i] for i in range(len(nodes))]
+        for i, a in enumerate(nodes):
+            for b in self.regulators(a):
+                targets[index[b]].append(i)
+        buf = ""
+        for i, t in enumerate(trees):
+            (ct, _), (cf, _) = _kleene_code(t)
+            buf += f"def e{i}(o, z):\n"
+            buf += f"    return 1 if {ct} else 0 if {cf} else None\n"
+        namespace = {}
+        try:
+            exec(compile(buf, "<minibn>", "exec"), namespace)
+            evals = [namespace[f"e{i}"] for i in range(len(nodes))]
+        except _COMPILE_ERRORS:
+            # see BooleanNetwork.__call__
+            evals = [lambda o, z, t=t: _eval3(t, o, z) for t in trees]
+
+        ig = nx.DiGraph(self.influence_graph())
+        cg = nx.condensation(ig)
+        order = []
+        for c in nx.topological_sort(cg):
+            members = sorted(cg.nodes[c]["members"],
+                        key=lambda a: (-ig.out_degree(a), index[a]))
+            order.extend(index[a] for a in members)
+
+        def propagate(o, z, queue):
+            while queue:
+                j = queue.pop()
+                for i in targets[j]:
+                    v = evals[i](o, z)
+                    b = 1 << i
+                    if v is not None:
+                        if not (o | z) & b:
+                            if v:
+                                o |= b
+                            else:
+                                z |= b
+                            queue.append(i)
+                        elif bool(o & b) != v:
+                            return None
+                    elif (o | z) & b:
+                        oz = _force3(trees[i], 1 if o & b else 0, o, z, queue)
+                        if oz is None:
+                            return None
+                        o, z = oz
+            return o, z
+
+        fixpoints = []
+        todo = [(0, 0, list(range(len(nodes))))]
+        while todo:
+            oz = propagate(*todo.pop())
+            if oz is None:
+                continue
+            o, z = oz
+            for i in order:
+                if not (o | z) >> i & 1:
+                    break
+            else:
+                fixpoints.append(State({a: o >> i & 1
+                                        for i, a in enumerate(nodes)}))
+                if limit is not None and len(fixpoints) >= limit:
+                    break
+                continue
+            todo.append((o, z | 1 << i, [i]))
+            todo.append((o | 1 << i, z, [i]))
+        return fixpoints
+
     def propagate_constants(self):
         """
         For each node having a constant function, replace references to that
@@ -396,17 +1459,27 @@ class BooleanNetwork(BaseNetwork):
         Modifies the Boolean network in-place.
         The set of constant nodes can be accessed with the `constants()` method.
         """
-        csts = {self.v(i): self.ba.TRUE if bool(f) else self.ba.FALSE
+        csts = {i: self.ba.TRUE if bool(f) else self.ba.FALSE
                     for i, f in self.constants().items()}
+        # the first round simplifies all the functions, the next ones only
+        # the functions referring to new constants
+        affected = list(self)
         while csts:
             new_csts = {}
-            for a, fa, in self.items():
-                if not is_constant(fa):
-                    fa = fa.subs(csts).simplify()
-                    self[a] = fa
-                    if is_constant(self[a]):
-                        new_csts[self.v(a)] = self[a]
+            for a in affected:
+                if is_constant(self[a]):
+                    continue
+                tr = {self.v(b): csts[b] for b in self.regulators(a)
+                        if b in csts}
+                f = self[a].subs(tr).simplify()
+                if not is_constant(f) and not f.get_symbols():
+                    # simplify() can leave terms like !(1)
+                    f = self.ba.TRUE if f() else self.ba.FALSE
+                self[a] = f
+                if is_constant(self[a]):
+                    new_csts[a] = self[a]
             csts = new_csts
+            affected = set().union(*map(self.targets, csts))
 
     def to_pint(self):
         pypint = import_colomoto_tool("pypint")
@@ -430,36 +1503,180 @@ class BooleanNetwork(BaseNetwork):
         with open(filename, "w") as fp:
             fp.write(self.source())
 
-    def dynamics(self, update_mode="asynchronous", init=None, loops=None):
+    def overlay(self, overrides=None, **kwargs):
         """
-        Returns a directed graph (`networkx.DiGraph` object) of the dynamics
-        with the `update_mode`.
-
-        :param update_mode: either `"asynchronous"` (or equivalently
-            `"fully-asynchronous"`), `"synchronous"` (or equivalently
-            `"parallel"`), `"general"`.
-            Alternatively, it can be a function returning an
-            :class:`.UpdateModeDynamics` object.
-        :param dict[str,int] init: Optional initial state from which the
-            dynamics is computed.
+        Returns a :py:class:`.BooleanNetworkOverlay` of this network where the
+        functions of nodes given in `overrides` (and `kwargs`) are replaced.
         """
-        if isinstance(update_mode, str):
-            if update_mode in ["asynchronous", "fully-asynchronous"]:
-                update_mode = FullyAsynchronousDynamics
-            elif update_mode == "general":
-                update_mode = GeneralAsynchronousDynamics
-            elif update_mode in ["synchronous", "parallel"]:
-                update_mode = SynchronousDynamics
-            else:
-                raise ValueError(f"Unknown update mode {update_mode}")
-        opts = {}
-        if loops is not None:
-            opts["loops"] = loops
-        update_mode = update_mode(self, **opts)
-        if init:
-            return update_mode.partial_dynamics(init)
-        else:
-            return update_mode.dynamics()
+        return BooleanNetworkOverlay(self, overrides, **kwargs)
+
+class BooleanNetworkOverlay(BooleanNetwork):
+    """
+    Boolean network having the functions of the network `base`, except for
+    the nodes given in `overrides` (and `kwargs`), typically to apply
+    mutations.
+
+    The overlay re-uses the dependencies, hashes and compiled code of the base
+    network for the nodes it does not override, as long as the base network
+    is not modified.
+    It is still a full `dict` of the node functions: the entries of the base
+    network are copied (the expressions themselves are shared), so that the
+    overlay keeps its functions when the base network is modified afterwards.
+    """
+    def __init__(self, base=None, overrides=None, ba=None, **kwargs):
+        super().__init__(ba=base.ba if base is not None else ba)
+        self.base = base
+        self._overrides = set()
+        if base is not None:
+            self._base_version = base._version
+            # one reference per node: the costly per-node data is shared
+            dict.update(self, base)
+        if overrides:
+            self.update(overrides)
+        self.update(kwargs)
+
+    def _base_network(self):
+        if self.base is not None and self.base._version != self._base_version:
+            self.base = None
+        return self.base
+
+    def _invalidate(self, a):
+        super()._invalidate(a)
+        self._overrides.add(a)
+
+    def _cached(self, name, a, compute):
+        base = self._base_network()
+        if base is not None and a not in self._overrides:
+            return base._cached(name, a, compute)
+        return super()._cached(name, a, compute)
+
+    def targets(self, b):
+        base = self._base_network()
+        if base is None:
+            return super().targets(b)
+        b = self._autokey(b)
+        targets = base.targets(b).difference(self._overrides)
+        targets.update(a for a in self._overrides
+                        if a in self and b in self.regulators(a))
+        return targets
+
+    def _compile(self):
+        base = self._base_network()
+        if base is None:
+            return super()._compile()
+        try:
+            compiled = base.compile()
+        except _COMPILE_ERRORS:
+            compiled = None
+        unchanged = set(self).difference(self._overrides)
+        return CompiledBooleanNetwork.from_network(self, compiled, unchanged)
+
+    def __copy__(self):
+        bn = super().__copy__()
+        bn._overrides = set(self._overrides)
+        return bn
+
+def _attractor_values(attractor):
+    """
+    Values of the nodes in `attractor`, where nodes which are not fixed are
+    associated with `"*"`
+    """
+    if isinstance(attractor, HypercubeCollection):
+        values = dict(attractor[0])
+        for h in attractor[1:]:
+            for a, v in h.items():
+                if values[a] != v:
+                    values[a] = "*"
+        return values
+    return dict(attractor)
+
+def _screen_fixpoints(bn, **kwargs):
+    return bn.fixpoints(**kwargs)
+
+def _screen_attractors(bn, update_mode="asynchronous", **kwargs):
+    return [_attractor_values(a) for a in bn.attractors(update_mode, **kwargs)]
+
+_screening_analyses = {
+    "fixpoints": _screen_fixpoints,
+    "attractors": _screen_attractors,
+}
+
+def _screen(bn, perturbation, analysis, kwargs):
+    if isinstance(analysis, str):
+        analysis = _screening_analyses[analysis]
+    return analysis(bn.overlay(perturbation), **kwargs)
+
+_screening_network = None
+
+def _init_screening(bn):
+    global _screening_network
+    _screening_network = bn
+
+def _screen_perturbation(perturbation, analysis, kwargs):
+    return _screen(_screening_network, perturbation, analysis, kwargs)
+
+def _perturbation_label(perturbation):
+    if not perturbation:
+        return "wild-type"
+    def value(v):
+        return str(int(v)) if isinstance(v, (bool, int)) else str(v)
+    return ",".join([f"{a}={value(v)}" for a, v in perturbation.items()])
+
+def screen_perturbations(bn, perturbations, analysis="fixpoints",
+        processes=None, **kwargs):
+    """
+    Computes an analysis of the Boolean network `bn` under each of the given
+    perturbations, and returns the results as a :py:class:`pandas.DataFrame`
+    indexed by perturbation (e.g., ``"a=0,b=1"``).
+
+    Each perturbed network is a :py:class:`.BooleanNetworkOverlay` of `bn`,
+    so that the analyses re-use the compiled functions of `bn`.
+
+    :param perturbations: iterable of `dict` associating nodes with their
+        forced value (0 or 1) or function.
+    :param analysis: either ``"fixpoints"`` (see
+        :py:meth:`.BooleanNetwork.fixpoints`), ``"attractors"`` (see
+        :py:meth:`.BooleanNetwork.attractors`, where nodes that are not fixed
+        in an attractor have value ``"*"``), or a function taking the
+        perturbed network and returning either a `dict` (one row), a list of
+        `dict` (one row each) or a single value (column named after the
+        function).
+        With `processes`, the function has to be picklable.
+    :param int processes: number of worker processes. The network `bn` is
+        sent only once to each of them.
+    :param kwargs: keyword arguments given to the analysis, e.g.,
+        ``update_mode`` for ``"attractors"``.
+
+    Perturbations leading to an empty list of results have a single row of
+    missing values.
+    """
+    bn = BooleanNetwork.auto_cast(bn)
+    perturbations = [dict(p) for p in perturbations]
+    try:
+        bn.compile()
+    except ValueError:
+        pass
+    if not processes or processes == 1:
+        results = [_screen(bn, p, analysis, kwargs) for p in perturbations]
+    else:
+        chunksize = max(1, len(perturbations) // (4*processes))
+        with ProcessPoolExecutor(processes, initializer=_init_screening,
+                initargs=(bn,)) as executor:
+            results = list(executor.map(_screen_perturbation, perturbations,
+                    itertools.repeat(analysis), itertools.repeat(kwargs),
+                    chunksize=chunksize))
+    name = analysis if isinstance(analysis, str) else analysis.__name__
+    index = []
+    rows = []
+    for p, result in zip(perturbations, results):
+        if isinstance(result, dict):
+            result = [result]
+        elif not isinstance(result, list):
+            result = [{name: result}]
+        for row in result or [{}]:
+            index.append(_perturbation_label(p))
+            rows.append(row)
+    return pd.DataFrame(rows, index=pd.Index(index, name="perturbation"))
 
 class MVVar(boolean.Symbol):
     def __init__(self, obj):
@@ -518,6 +1735,84 @@ class MVVar(boolean.Symbol):
     def __hash__(self):
         return super().__hash__()
 
+class CompiledMultiValuedNetwork(object):
+    """
+    Python step functions generated from the level specifications of a
+    :class:`.MultiValuedNetwork`, as returned by
+    :py:meth:`.MultiValuedNetwork.compile`.
+
+    The image of a node is the highest level whose condition holds, or 0.
+    Configurations are either tuples of levels, following the order of
+    `nodes`, or integers in mixed radix, where the level of `nodes[i]` is
+    `s // weights[i] % (levels[i]+1)`.
+    """
+    def __init__(self, nodes, levels, source):
+        self.nodes = tuple(nodes)
+        self.levels = tuple(levels)
+        self.index = {a: i for i, a in enumerate(self.nodes)}
+        self.weights = _level_weights(self.levels)
+        self.size = math.prod([m+1 for m in self.levels])
+        self.source = source
+        namespace = {}
+        exec(compile(source, "<minibn>", "exec"), namespace)
+        self.step = namespace["step"]
+        self.step_int = namespace["step_int"]
+
+    @classmethod
+    def from_network(celf, mn):
+        nodes = tuple(mn)
+        index = {a: i for i, a in enumerate(nodes)}
+        levels = mn.max_levels()
+        levels = [levels[a] for a in nodes]
+        weights = _level_weights(levels)
+        def var(v):
+            a, i = v if isinstance(v, tuple) else (v, 1)
+            if a not in index:
+                raise ValueError(f"Unknown node {a!r}")
+            used.add(index[a])
+            return f"(x{index[a]} >= {i})"
+        exprs = []
+        used = set()
+        for a in nodes:
+            expr = "0"
+            for level, cond in sorted(mn._level_conditions(a),
+                                        key=lambda lc: lc[0]):
+                expr = f"({level} if {_pyexpr(mn.ba, cond, var)} else {expr})"
+            exprs.append(expr)
+        n = len(nodes)
+        buf = "def step(x):\n"
+        if n:
+            buf += "    {}, = x\n".format(", ".join([f"x{i}" for i in range(n)]))
+        buf += "    return ({})\n".format("".join([f"{e}, " for e in exprs]))
+        buf += "def step_int(s):\n"
+        for i in sorted(used):
+            buf += f"    x{i} = s // {weights[i]} % {levels[i]+1}\n"
+        buf += "    z = 0\n"
+        for i, e in enumerate(exprs):
+            buf += f"    z += {e} * {weights[i]}\n"
+        buf += "    return z\n"
+        return celf(nodes, levels, buf)
+
+    def __reduce__(self):
+        return (self.__class__, (self.nodes, self.levels, self.source))
+
+    def encode(self, x):
+        """
+        Returns the integer encoding of configuration `x` (`dict`)
+        """
+        return sum(int(x[a]) * w for a, w in zip(self.nodes, self.weights))
+
+    def decode(self, s):
+        """
+        Returns the configuration (`dict`) encoded by integer `s`
+        """
+        return {a: s // w % (m+1)
+                for a, w, m in zip(self.nodes, self.weights, self.levels)}
+
+    def __call__(self, cfg):
+        return dict(zip(self.nodes,
+                    self.step(tuple([cfg[a] for a in self.nodes]))))
+
 class MultiValuedNetwork(BaseNetwork):
     biolqm_format = "mnet"
     def __init__(self, *args, **kwargs):
@@ -551,11 +1846,13 @@ class MultiValuedNetwork(BaseNetwork):
         if isinstance(spec, boolean.Expression):
             super().rewrite(k, tr)
         elif isinstance(spec, dict):
+            spec = dict(spec)
             if a.is_instanciated():
                 spec[a.level()] = _rewrite(spec[a.level()])
             else:
-                for k, f in spec.items():
-                    spec[k] = _rewrite(f)
+                for l, f in spec.items():
+                    spec[l] = _rewrite(f)
+            self[k] = spec
         else:
             if a.is_instanciated():
                 def d_rewrite(df):
@@ -573,10 +1870,11 @@ class MultiValuedNetwork(BaseNetwork):
         if isinstance(a, str):
             (a,) = self.vars(a)
         if isinstance(f, str):
-            f = self.ba.parse(f)
+            f = self._parse(f)
         k = self._autokey(a.nodevar())
-        self[k] = self._normalize(k, self[k]) if k in self else []
-        self[k].append((a, f))
+        spec = list(self._normalize(k, self[k])) if k in self else []
+        spec.append((a, f))
+        self[k] = spec
 
     def source(self, sep=" <- "):
         buf = ""
@@ -586,32 +1884,86 @@ class MultiValuedNetwork(BaseNetwork):
         return buf
 
     def import_data(self, data):
-        for line in data:
+        for lineno, line in enumerate(data, 1):
             line = line.strip()
             if not line:
                 continue
-            left, right = line.split("<-")
-            self.append(left.strip(), right.strip())
+            parts = line.split("<-")
+            if len(parts) != 2:
+                raise ParseError("Expected exactly one separator '<-'",
+                        lineno=lineno)
+            left, right = parts
+            self.append(left.strip(), self._parse(right, lineno))
+
+    def _conditions(self, spec):
+        if isinstance(spec, dict):
+            return list(spec.values())
+        elif isinstance(spec, boolean.Expression):
+            return [spec]
+        return [f for _, f in spec]
 
-    def influence_graph(self):
-        import networkx as nx
+    def _function_symbols(self, spec):
+        return frozenset(self._autokey(s.nodevar())
+                            for f in self._conditions(spec)
+                            for s in f.get_symbols())
+
+    def _function_influences(self, spec):
         influences = set()
-        ig = nx.MultiDiGraph()
-        for a, f in self.items():
-            ig.add_node(a)
-            for d, spec in self._normalize(a, f):
-                for lit in spec.simplify().literalize().get_literals():
-                    if isinstance(lit, boolean.NOT):
-                        b = lit.args[0]
-                        sign = -1
-                    else:
-                        b = lit
-                        sign = 1
-                    b = self._autokey(b.nodevar())
-                    influences.add((b,a,sign))
-        for (b, a, sign) in influences:
-            ig.add_edge(b, a, sign=sign, label="+" if sign > 0 else "-")
-        return ig
+        for f in self._conditions(spec):
+            for lit in f.simplify().literalize().get_literals():
+                if isinstance(lit, boolean.NOT):
+                    b = lit.args[0]
+                    sign = -1
+                else:
+                    b = lit
+                    sign = 1
+                influences.add((self._autokey(b.nodevar()), sign))
+        return frozenset(influences)
+
+    def _level_conditions(self, a):
+        """
+        Returns the list of pairs `(level, condition)` of node `a`
+        """
+        return [(d.level() if d.is_instanciated() else 1, f)
+                for d, f in self._normalize(a, self[a])]
+
+    def max_levels(self):
+        """
+        Returns the maximum level of each node, which is the highest level
+        specified for it or tested by an atom `a:i` (at least 1).
+        """
+        levels = {a: 1 for a in self}
+        def register(a, i):
+            if a in levels and i > levels[a]:
+                levels[a] = i
+        for a in self:
+            for level, f in self._level_conditions(a):
+                register(a, level)
+                for v in f.get_symbols():
+                    if v.is_instanciated():
+                        register(*v.obj)
+        return levels
+
+    def compile(self):
+        """
+        Returns a :class:`.CompiledMultiValuedNetwork` object gathering the
+        level specifications in Python step functions.
+        The result is cached until a node specification is modified.
+
+        Raises `ValueError` if a condition refers to a symbol which is not a
+        node of the network.
+        """
+        if self._compiled is None:
+            self._compiled = CompiledMultiValuedNetwork.from_network(self)
+        return self._compiled
+
+    def __call__(self, cfg):
+        """
+        Returns the image of the configuration `cfg`: each node takes the
+        highest level whose condition holds, or 0, where the atom `a:i` holds
+        whenever the level of `a` is at least `i`, and `a` stands for `a:1`.
+        """
+        return self.compile()(cfg)
 
 
 class _Run(object):
@@ -619,11 +1971,14 @@ class _Run(object):
         """
         Run at most `k` steps of an execution of given `model` from initial
         configuration `init`.
+        With multi-valued networks, the updated nodes change of one level
+        towards the level of their image.
 
         Stops at fixpoints.
         """
-        if not isinstance(model, BooleanNetwork):
-            raise TypeError("Only BooleanNetwork objects are supported")
+        if not isinstance(model, (BooleanNetwork, MultiValuedNetwork)):
+            raise TypeError("Only BooleanNetwork and MultiValuedNetwork "
+                            "objects are supported")
         self.model = model
         self.init = init
         self.k = k
@@ -632,9 +1987,39 @@ class _Run(object):
         Return the sub-sequence of `nodes` to actually update
         """
         raise NotImplementedError
+    def _compiled(self):
+        if isinstance(self.model, BooleanNetwork):
+            try:
+                return self.model.compile()
+            except _COMPILE_ERRORS:
+                pass
     def __iter__(self):
         cur = self.init.copy()
         yield cur.copy()
+        compiled = self._compiled()
+        if compiled is not None:
+            # only the targets of the updated nodes are re-evaluated
+            nodes = compiled.nodes
+            s = compiled.encode(cur)
+            z = compiled.step_int(s)
+            for i in range(self.k):
+                D = z ^ s
+                if not D:
+                    return
+                update = []
+                while D:
+                    b = D & -D
+                    update.append(nodes[b.bit_length()-1])
+                    D ^= b
+                mask = 0
+                for a in self.select_for_update(update):
+                    j = compiled.index[a]
+                    cur[a] = z >> j & 1
+                    mask |= 1 << j
+                s ^= mask
+                z = compiled.update_int(s, z, mask)
+                yield cur.copy()
+            return
         for i in range(self.k):
             target = self.model(cur)
             update = [a for a,i in target.items() if cur[a] != i]
@@ -642,7 +2027,7 @@ class _Run(object):
                 return
             update = self.select_for_update(update)
             for a in update:
-                cur[a] = target[a]
+                cur[a] += 1 if target[a] > cur[a] else -1
             yield cur.copy()
 
 class _RandomRun(_Run):
@@ -675,25 +2060,982 @@ class GAsyncRun(_RandomRun):
         return [a for (a,sel) in zip(nodes, mask) if sel == "1"]
 
 
+class _EnsembleRun(object):
+    def __init__(self, model, init, k, trajectories=1, seed=None):
+        """
+        Run simultaneously `trajectories` executions of at most `k` steps of
+        the given `model`.
+
+        `init` is either an initial configuration (`dict`) shared by all the
+        executions, or an array of shape `(trajectories, n)` giving one
+        initial configuration per execution, with nodes in the order of the
+        model.
+
+        Executions stay at fixpoints once reached.
+        """
+        if not isinstance(model, BooleanNetwork):
+            raise TypeError("Only BooleanNetwork objects are supported")
+        self.model = model
+        self.nodes = tuple(model)
+        if isinstance(init, dict):
+            init = np.tile([init[a] for a in self.nodes], (trajectories, 1))
+        self.init = np.asarray(init, dtype=bool)
+        if self.init.shape[1:] != (len(self.nodes),):
+            raise ValueError(f"Expected an array of shape (m, {len(self.nodes)})")
+        self.k = k
+        self.random = np.random.default_rng(seed)
+
+    def select_for_update(self, U):
+        """
+        Given the Boolean matrix `U` of the nodes which can change (one row per
+        execution), returns the Boolean matrix of the nodes to actually update
+        """
+        raise NotImplementedError
+
+    def __iter__(self):
+        """
+        Iterates over the successive configurations of the executions, as
+        Boolean arrays of shape `(trajectories, n)`
+        """
+        step_batch = self.model.compile().step_batch
+        X = self.init
+        yield X
+        for i in range(self.k):
+            Z = step_batch(X)
+            U = Z != X
+            if not U.any():
+                for j in range(i, self.k):
+                    yield X
+                return
+            X = np.where(self.select_for_update(U), Z, X)
+            yield X
+
+    def trajectories(self):
+        """
+        Returns the array of shape `(trajectories, k+1, n)` of the
+        configurations of each execution at each step.
+        """
+        res = np.empty((len(self.init), self.k+1, len(self.nodes)),
+                        dtype=np.uint8)
+        for i, X in enumerate(self):
+            res[:,i] = X
+        return res
+
+    def occupancy(self):
+        """
+        Returns a `pandas.DataFrame` object giving, for each step (rows), the
+        fraction of the executions where each node (columns) is active.
+        """
+        return pd.DataFrame([X.mean(axis=0) for X in self],
+                            columns=self.nodes)
+
+class SyncEnsembleRun(_EnsembleRun):
+    """
+    Synchronous update runs
+    """
+    def select_for_update(self, U):
+        return U
+class FAsyncEnsembleRun(_EnsembleRun):
+    """
+    Fully-asynchronous update runs
+    """
+    def select_for_update(self, U):
+        counts = U.sum(axis=1)
+        r = np.floor(self.random.random(len(U)) * counts).astype(np.int64)
+        return U & (U.cumsum(axis=1) == (r+1)[:,None])
+class GAsyncEnsembleRun(_EnsembleRun):
+    """
+    (General) asynchronous update runs
+    """
+    def select_for_update(self, U):
+        S = U & (self.random.random(U.shape) < 0.5)
+        todo = U.any(axis=1) & ~S.any(axis=1)
+        while todo.any():
+            S[todo] = U[todo] & (self.random.random((todo.sum(), U.shape[1])) < 0.5)
+            todo = U.any(axis=1) & ~S.any(axis=1)
+        return S
+
+
+def _tarjan(roots, successors):
+    """
+    Iterative Tarjan algorithm over the states reachable from `roots`, where
+    `successors(v)` returns the successors of state `v`.
+
+    Yields the pairs `(scc, terminal)` for each strongly connected component
+    (list of states), in reverse topological order, where `terminal` is
+    `True` if no transition leaves the component.
+    """
+    index = {}
+    lowlink = {}
+    stack = []
+    onstack = set()
+    exiting = set()
+    for root in roots:
+        if root in index:
+            continue
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        onstack.add(root)
+        work = [(root, iter(successors(root)))]
+        while work:
+            v, it = work[-1]
+            for w in it:
+                if w not in index:
+                    index[w] = lowlink[w] = len(index)
+                    stack.append(w)
+                    onstack.add(w)
+                    work.append((w, iter(successors(w))))
+                    break
+                elif w in onstack:
+                    if index[w] < lowlink[v]:
+                        lowlink[v] = index[w]
+                else:
+                    exiting.add(v)
+            else:
+                work.pop()
+                if lowlink[v] == index[v]:
+                    scc = []
+                    terminal = True
+                    while True:
+                        w = stack.pop()
+                        onstack.discard(w)
+                        if w in exiting:
+                            terminal = False
+                            exiting.discard(w)
+                        scc.append(w)
+                        if w == v:
+                            break
+                    yield scc, terminal
+                    if work:
+                        exiting.add(work[-1][0])
+                elif lowlink[v] < lowlink[work[-1][0]]:
+                    lowlink[work[-1][0]] = lowlink[v]
+
+def _decoder(nodes, levels=None):
+    """
+    Returns the function decoding integer states, in mixed radix following
+    the maximum `levels` of the nodes if given, binary otherwise
+    """
+    if levels is None or all(m == 1 for m in levels):
+        def decode(s):
+            return {a: (s >> i) & 1 for i, a in enumerate(nodes)}
+    else:
+        weights = np.cumprod([1] + [m+1 for m in levels[:-1]]).tolist()
+        def decode(s):
+            return {a: s // w % (m+1)
+                    for a, w, m in zip(nodes, weights, levels)}
+    return decode
+
+def _states_object(nodes, states, levels=None):
+    """
+    Returns a :py:class:`.State` object if `states` (integer encodings)
+    has a single element, a :py:class:`.HypercubeCollection` otherwise.
+    """
+    decode = _decoder(nodes, levels)
+    if len(states) == 1:
+        return State(decode(states[0]))
+    return HypercubeCollection([Hypercube(decode(s)) for s in sorted(states)])
+
+class StateTransitionGraph(object):
+    """
+    Compact state transition graph, stored as a CSR adjacency matrix.
+
+    `states` is the sorted array of the integer encodings of the states
+    (bit `i` is the value of `nodes[i]`); the successors of the state
+    `states[j]` are the states `states[indices[indptr[j]:indptr[j+1]]]`.
+
+    It is returned by :py:meth:`.UpdateModeDynamics.dynamics` with
+    `backend="csr"`.
+    With multi-valued networks, `levels` gives the maximum level of each node,
+    and states are encoded in mixed radix (see
+    :py:class:`.CompiledMultiValuedNetwork`).
+    """
+    def __init__(self, nodes, states, sources, targets, encoding="str",
+            levels=None):
+        self.nodes = tuple(nodes)
+        self.encoding = encoding
+        self.levels = levels
+        self._decode = _decoder(self.nodes, levels)
+        self.states = np.asarray(states, dtype=np.int64)
+        N = len(self.states)
+        src = np.searchsorted(self.states, sources)
+        dst = np.searchsorted(self.states, targets)
+        order = np.lexsort((dst, src))
+        src, dst = src[order], dst[order]
+        if len(src):
+            keep = np.ones(len(src), dtype=bool)
+            keep[1:] = (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])
+            src, dst = src[keep], dst[keep]
+        self.indptr = np.zeros(N+1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=N), out=self.indptr[1:])
+        self.indices = dst.astype(np.int32 if N < 2**31 else np.int64)
+        self._nx = {}
+
+    def __len__(self):
+        return len(self.states)
+
+    def number_of_states(self):
+        return len(self.states)
+
+    def number_of_edges(self):
+        return len(self.indices)
+
+    def index(self, s):
+        """
+        Returns the position of the state `s` (integer encoding) in `states`
+        """
+        j = int(np.searchsorted(self.states, s))
+        if j == len(self.states) or self.states[j] != s:
+            raise KeyError(s)
+        return j
+
+    def successors(self, s):
+        """
+        Returns the array of the successors of state `s` (integer encoding)
+        """
+        j = self.index(s)
+        return self.states[self.indices[self.indptr[j]:self.indptr[j+1]]]
+
+    def decode(self, s):
+        return self._decode(int(s))
+
+    def to_networkx(self, encoding=None):
+        """
+        Returns the `networkx.DiGraph` object of this graph.
+        The conversion is made at the first call, and cached.
+
+        :param encoding: identifiers of the states, see
+            :py:meth:`.UpdateModeDynamics.dynamics`. Defaults to the encoding
+            given when computing the dynamics.
+        """
+        encoding = encoding or self.encoding
+        if encoding not in self._nx:
+            labels = _batch_labeller(len(self.nodes), encoding, self.levels)
+            d = nx.DiGraph()
+            d.add_nodes_from(labels(self.states))
+            src = np.repeat(self.states, np.diff(self.indptr))
+            dst = self.states[self.indices]
+            d.add_edges_from(zip(labels(src), labels(dst)))
+            self._nx[encoding] = d
+        return self._nx[encoding]
+
+    def _sccs(self):
+        indptr = self.indptr.tolist()
+        indices = self.indices.tolist()
+        def successors(j):
+            return indices[indptr[j]:indptr[j+1]]
+        return _tarjan(range(len(self.states)), successors)
+
+    def strongly_connected_components(self):
+        """
+        Returns the list of the strongly connected components, as arrays of
+        integer encodings of states.
+        """
+        return [self.states[sorted(scc)] for scc, _ in self._sccs()]
+
+    def attractors(self):
+        """
+        Returns the list of the attractors (terminal strongly connected
+        components), each being either a :py:class:`.State` object (fixed
+        point) or a :py:class:`.HypercubeCollection` object (list of the
+        states of a cyclic attractor).
+        """
+        return [_states_object(self.nodes, self.states[scc].tolist(),
+                                self.levels)
+                for scc, terminal in self._sccs() if terminal]
+
+    def _reverse_reach(self, seeds, rindptr, rindices):
+        """
+        Returns the Boolean mask of the states (positions) from which one of
+        the positions `seeds` is reachable, given the transposed CSR arrays
+        """
+        mask = np.zeros(len(self.states), dtype=bool)
+        mask[seeds] = True
+        frontier = np.asarray(seeds, dtype=np.int64)
+        while len(frontier):
+            starts = rindptr[frontier]
+            lens = rindptr[frontier+1] - starts
+            total = int(lens.sum())
+            if not total:
+                break
+            pos = np.arange(total) + np.repeat(starts - np.cumsum(lens) + lens,
+                                                lens)
+            preds = np.unique(rindices[pos])
+            frontier = preds[~mask[preds]]
+            mask[frontier] = True
+        return mask
+
+    def _functional_basins(self):
+        """
+        Returns the pair `(attractors, labels)` for a graph where each state
+        has at most one successor, by pointer jumping
+        """
+        N = len(self.states)
+        f = np.arange(N)
+        has = np.diff(self.indptr) == 1
+        f[has] = self.indices[self.indptr[:-1][has]]
+        g = f
+        m = np.arange(N)
+        for _ in range(max(1, int(N-1).bit_length())):
+            m = np.minimum(m, m[g])
+            g = g[g]
+        # g[j] is on the cycle reached from j, and m[g[j]] the least position
+        # on that cycle
+        reps, labels = np.unique(m[g], return_inverse=True)
+        cycles = np.unique(g)
+        cycle_labels = np.searchsorted(reps, m[cycles])
+        attractors = [self.states[cycles[cycle_labels == i]].tolist()
+                      for i in range(len(reps))]
+        return attractors, labels.ravel()
+
+    def basins(self, labels=False):
+        """
+        Returns the pair `(attractors, sizes)` where `attractors` is the list
+        of attractors (see :py:meth:`.attractors`) and `sizes[i]` is the
+        number of states from which `attractors[i]` is reachable.
+
+        When each state has at most one successor (e.g., synchronous
+        dynamics), basins are computed by pointer jumping over the array of
+        successors; otherwise, by reverse breadth-first searches from each
+        attractor over the transposed CSR arrays.
+
+        :param bool labels: if `True`, returns instead the triplet
+            `(attractors, sizes, labels)` where `labels[j]` is the index of
+            the only attractor reachable from `states[j]`, or `-1` if several
+            are reachable.
+        """
+        N = len(self.states)
+        if N and np.diff(self.indptr).max(initial=0) <= 1:
+            attractors, L = self._functional_basins()
+            sizes = np.bincount(L, minlength=len(attractors))
+        else:
+            attractors = [sorted(scc) for scc, terminal in self._sccs()
+                          if terminal]
+            src = np.repeat(np.arange(N), np.diff(self.indptr))
+            order = np.argsort(self.indices, kind="stable")
+            rindices = src[order]
+            rindptr = np.zeros(N+1, dtype=np.int64)
+            np.cumsum(np.bincount(self.indices, minlength=N),
+                      out=rindptr[1:])
+            sizes = np.zeros(len(attractors), dtype=np.int64)
+            L = np.full(N, -1, dtype=np.int64)
+            reached = np.zeros(N, dtype=bool)
+            for i, scc in enumerate(attractors):
+                mask = self._reverse_reach(scc, rindptr, rindices)
+                sizes[i] = mask.sum()
+                L[mask & ~reached] = i
+                L[mask & reached] = -1
+                reached |= mask
+            attractors = [self.states[scc].tolist() for scc in attractors]
+        attractors = [_states_object(self.nodes, states, self.levels)
+                      for states in attractors]
+        if labels:
+            return attractors, sizes, L
+        return attractors, sizes
+
+class LazyStateTransitionGraph(object):
+    """
+    View of the state transition graph of an :py:class:`.UpdateModeDynamics`
+    object, whose transitions are computed on demand.
+
+    States are identified as in the graphs returned by
+    :py:meth:`.UpdateModeDynamics.dynamics` with the same `encoding`;
+    configurations (`dict`) are accepted as well.
+    The successors of the `cache_size` most recently expanded states are kept
+    in memory, and the traversals store only the states they visit.
+    The number of states is given by the `size` attribute, as it can exceed
+    the range of `len()`.
+
+    It is returned by :py:meth:`.UpdateModeDynamics.dynamics` with
+    `backend="lazy"`.
+    """
+    def __init__(self, dynamics, encoding="str", cache_size=2**16):
+        self.dynamics = dynamics
+        self.nodes = dynamics.nodes
+        self.size = dynamics.size
+        self.encoding = encoding
+        self.cache_size = cache_size
+        self._label = dynamics._labeller(encoding) or (lambda s: s)
+        self._cache = OrderedDict()
+
+    def number_of_nodes(self):
+        return self.size
+
+    def _state(self, x):
+        if isinstance(x, dict):
+            return self.dynamics.encode(x)
+        if self.encoding == "str":
+            if len(x) != len(self.nodes) or not all("0" <= c <= "9"
+                    and int(c) <= m for c, m in zip(x, self.dynamics.levels)):
+                raise KeyError(x)
+            return self.dynamics.encode(dict(zip(self.nodes, map(int, x))))
+        s = int(x)
+        if not 0 <= s < self.size:
+            raise KeyError(x)
+        return s
+
+    def has_node(self, x):
+        try:
+            self._state(x)
+        except (KeyError, ValueError):
+            return False
+        return True
+
+    __contains__ = has_node
+
+    def successors_int(self, s):
+        """
+        Returns the tuple of the successors of state `s` (integer encoding)
+        """
+        cache = self._cache
+        if s in cache:
+            cache.move_to_end(s)
+            return cache[s]
+        loops = self.dynamics.loops
+        succ = tuple(y for y in dict.fromkeys(self.dynamics.successors_int(s))
+                        if y != s or loops)
+        cache[s] = succ
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return succ
+
+    def successors(self, x):
+        """
+        Returns the list of the successors of state `x`
+        """
+        return [self._label(y) for y in self.successors_int(self._state(x))]
+
+    neighbors = successors
+
+    def out_degree(self, x):
+        return len(self.successors_int(self._state(x)))
+
+    def has_edge(self, x, y):
+        return self._state(y) in self.successors_int(self._state(x))
+
+    def _bfs_edges(self, s, depth_limit=None):
+        visited = {s}
+        layer = [s]
+        depth = 0
+        while layer and (depth_limit is None or depth < depth_limit):
+            depth += 1
+            next_layer = []
+            for u in layer:
+                for v in self.successors_int(u):
+                    if v not in visited:
+                        visited.add(v)
+                        next_layer.append(v)
+                        yield u, v
+            layer = next_layer
+
+    def bfs_edges(self, source, depth_limit=None):
+        """
+        Yields the edges of a breadth-first search tree from `source`,
+        exploring states at distance at most `depth_limit` if given.
+        """
+        label = self._label
+        for u, v in self._bfs_edges(self._state(source), depth_limit):
+            yield label(u), label(v)
+
+    def bfs_layers(self, source, depth_limit=None):
+        """
+        Yields the lists of the states at distance 0, 1, ... from `source`
+        (up to `depth_limit` if given).
+        """
+        s = self._state(source)
+        depth = {s: 0}
+        layer = [s]
+        for u, v in self._bfs_edges(s, depth_limit):
+            depth[v] = depth[u] + 1
+            if depth[v] > depth[layer[-1]]:
+                yield [self._label(w) for w in layer]
+                layer = []
+            layer.append(v)
+        yield [self._label(w) for w in layer]
+
+    def shortest_path(self, source, target):
+        """
+        Returns the list of the states along a shortest path from `source` to
+        `target`.
+        Raises `networkx.NetworkXNoPath` if `target` is not reachable.
+        """
+        s = self._state(source)
+        t = self._state(target)
+        if s != t:
+            parent = {}
+            for u, v in self._bfs_edges(s):
+                parent[v] = u
+                if v == t:
+                    break
+            else:
+                raise nx.NetworkXNoPath(f"No path from {source} to {target}")
+        path = [t]
+        while path[-1] != s:
+            path.append(parent[path[-1]])
+        return [self._label(w) for w in reversed(path)]
+
+    def shortest_path_length(self, source, target):
+        return len(self.shortest_path(source, target)) - 1
+
+def _batch_labeller(n, encoding, levels=None):
+    if encoding == "int":
+        return lambda S: S.tolist()
+    elif encoding == "str":
+        if not n:
+            return lambda S: [""]*len(S)
+        if levels is None or all(m == 1 for m in levels):
+            shifts = np.arange(n, dtype=np.int64)
+            def digits(S):
+                return (S[:, None] >> shifts) & 1
+        else:
+            weights = np.cumprod([1] + [m+1 for m in levels[:-1]])
+            radix = np.array(levels, dtype=np.int64) + 1
+            def digits(S):
+                return S[:, None] // weights % radix
+            if max(levels) >= 10:
+                # levels are joined as by _labeller, with several digits
+                def labels(S):
+                    return ["".join(map(str, x)) for x in digits(S).tolist()]
+                return labels
+        def labels(S):
+            B = digits(S).astype(np.uint8) + ord("0")
+            return B.view(f"S{n}").ravel().astype(str).tolist()
+        return labels
+    raise ValueError(f"Unknown state encoding {encoding}")
+
+_shard_dynamics = None
+
+def _init_dynamics_shard(dynamics):
+    global _shard_dynamics
+    _shard_dynamics = dynamics
+
+def _dynamics_shard(start, stop):
+    """
+    Transitions from the states `start` to `stop` (excluded) of the update mode
+    given to the worker with :py:func:`._init_dynamics_shard`
+    """
+    src, dst = [], []
+    batch_size = _shard_dynamics.batch_size
+    for b in range(start, stop, batch_size):
+        S = np.arange(b, min(b + batch_size, stop), dtype=np.int64)
+        batch_src, batch_dst = _shard_dynamics.transitions_int(S)
+        src.append(batch_src)
+        dst.append(batch_dst)
+    return np.concatenate(src), np.concatenate(dst)
+
+def _state_owners(S, processes):
+    """
+    Returns the index of the worker owning each state of the integer array
+    `S`, by hashing the states
+    """
+    H = (S.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)) >> np.uint64(32)
+    return (H % np.uint64(processes)).astype(np.int64)
+
+def _reachability_worker(dynamics, rank, inboxes, results, edges):
+    """
+    Worker of :py:meth:`.UpdateModeDynamics._parallel_reachability` owning the
+    states `s` with `_state_owners(s) == rank`.
+
+    Messages received in `inboxes[rank]`:
+
+    - `("init", s)`: adds the state `s` to the frontier;
+    - `("expand",)`: computes the transitions from the frontier, and sends
+      their targets to their owners, followed by `("end",)`;
+    - `("states", S)`: candidate states for the next frontier;
+    - `("end",)`: once received from all the other workers (and after
+      expanding), the new frontier is made of the candidate states not yet
+      visited, and `("round", rank, number of new states, sources, targets)`
+      is put in `results` (transitions only if `edges` is `True`);
+    - `("stop",)`: puts `("states", rank, visited states)` in `results` and
+      exits.
+
+    The visited states are kept in a set, as a bitmap of all the states in
+    each worker would take `processes` times the memory of a single one.
+    """
+    try:
+        processes = len(inboxes)
+        inbox = inboxes[rank]
+        visited = _VisitedStates(dynamics.size, bitmap_size=0)
+        frontier = np.empty(0, dtype=np.int64)
+        candidates = []
+        ends = 0
+        expanded = False
+        src, dst = [], []
+        while True:
+            msg = inbox.get()
+            kind = msg[0]
+            if kind == "init":
+                frontier = visited.add_new([msg[1]])
+            elif kind == "expand":
+                for b in range(0, len(frontier), dynamics.batch_size):
+                    S = frontier[b:b+dynamics.batch_size]
+                    batch_src, batch_dst = dynamics.transitions_int(S)
+                    if edges:
+                        src.append(batch_src)
+                        dst.append(batch_dst)
+                    T = np.unique(batch_dst)
+                    owners = _state_owners(T, processes)
+                    for j in range(processes):
+                        T_j = T[owners == j]
+                        if j == rank:
+                            candidates.append(T_j)
+                        elif len(T_j):
+                            inboxes[j].put(("states", T_j))
+                for j in range(processes):
+                    if j != rank:
+                        inboxes[j].put(("end",))
+                expanded = True
+            elif kind == "states":
+                candidates.append(msg[1])
+            elif kind == "end":
+                ends += 1
+            elif kind == "stop":
+                results.put(("states", rank, visited.sorted_states()))
+                return
+            if expanded and ends == processes - 1:
+                frontier = visited.add_new(visited.concatenate(candidates))
+                results.put(("round", rank, len(frontier),
+                             visited.concatenate(src), visited.concatenate(dst)))
+                candidates, src, dst = [], [], []
+                ends = 0
+                expanded = False
+    except Exception as e:
+        results.put(("error", rank, e))
+
+class _VisitedStates(object):
+    """
+    Set of states (integer encodings) among `size` states, stored as a bitmap
+    when `size` is at most `bitmap_size` (default :py:attr:`.bitmap_size`),
+    as a set of integers otherwise.
+    With more than 2**62 states, arrays of states are replaced by lists.
+    """
+    bitmap_size = 2**32
+
+    def __init__(self, size, bitmap_size=None):
+        self.wide = size > 2**62
+        if bitmap_size is None:
+            bitmap_size = self.bitmap_size
+        if size <= bitmap_size:
+            self.bitmap = np.zeros(-(-size // 8), dtype=np.uint8)
+            self.states = None
+        else:
+            self.bitmap = None
+            self.states = set()
+        self.count = 0
+
+    def add_new(self, S):
+        """
+        Adds the states `S` and returns the sorted array of the ones which were
+        not in the set
+        """
+        if self.bitmap is not None:
+            S = np.unique(np.asarray(S, dtype=np.int64))
+            bits = np.left_shift(1, S & 7).astype(np.uint8)
+            sel = (self.bitmap[S >> 3] & bits) == 0
+            S = S[sel]
+            np.bitwise_or.at(self.bitmap, S >> 3, bits[sel])
+        else:
+            S = sorted(set(S.tolist() if isinstance(S, np.ndarray) else S)
+                        .difference(self.states))
+            self.states.update(S)
+            if not self.wide:
+                S = np.array(S, dtype=np.int64)
+        self.count += len(S)
+        return S
+
+    def concatenate(self, arrays):
+        if self.wide:
+            return list(itertools.chain.from_iterable(arrays))
+        return np.concatenate(arrays) if arrays else np.empty(0, np.int64)
+
+    def sorted_states(self):
+        """
+        Returns the sorted array (list with more than 2**62 states) of the
+        states in the set
+        """
+        if self.bitmap is not None:
+            J = np.flatnonzero(self.bitmap)
+            bits = np.unpackbits(self.bitmap[J, None], axis=1,
+                                 bitorder="little").astype(bool)
+            return (J[:, None] * 8 + np.arange(8))[bits]
+        S = sorted(self.states)
+        return S if self.wide else np.array(S, dtype=np.int64)
+
+    def pack(self, S):
+        """
+        Returns the states `S` as an array: integers, or rows of little-endian
+        bytes with more than 2**62 states
+        """
+        if not self.wide:
+            return np.asarray(S, dtype=np.int64)
+        width = max([s.bit_length() for s in S], default=0) // 8 + 1
+        return np.frombuffer(b"".join([s.to_bytes(width, "little")
+                            for s in S]), dtype=np.uint8).reshape(-1, width)
+
+    def unpack(self, A):
+        if not self.wide:
+            return A
+        return [int.from_bytes(row.tobytes(), "little") for row in A]
+
+class _Exploration(object):
+    """
+    Breadth-first exploration of the dynamics `dynamics`
+    (:py:class:`.UpdateModeDynamics`) from the states `frontier`, already
+    added to `visited` (:py:class:`._VisitedStates`).
+
+    It can be saved to a file (see :py:meth:`.save`) between two batches
+    of transitions, and resumed with :py:meth:`.load`.
+    """
+    def __init__(self, dynamics, frontier, visited):
+        self.dynamics = dynamics
+        self.visited = visited
+        self.frontier = frontier
+        self.next = []
+
+    @classmethod
+    def start(celf, dynamics, init):
+        visited = _VisitedStates(dynamics.size)
+        frontier = visited.add_new([dynamics.encode(
+                            {i: int(init[i]) for i in dynamics.nodes})])
+        return celf(dynamics, frontier, visited)
+
+    def transitions(self):
+        """
+        Yields the transitions by batches of at most
+        :py:attr:`.UpdateModeDynamics.batch_size` source states, as pairs
+        `(sources, targets)` of integer arrays.
+        """
+        dynamics = self.dynamics
+        visited = self.visited
+        batch_size = dynamics.batch_size
+        while len(self.frontier):
+            frontier = self.frontier
+            self.next = []
+            for b in range(0, len(frontier), batch_size):
+                src, dst = dynamics._batch_transitions(
+                                frontier[b:b+batch_size], visited.wide)
+                self.next.append(visited.add_new(dst))
+                self.frontier = frontier[b+batch_size:]
+                yield src, dst
+            self.frontier, self.next = visited.concatenate(self.next), []
+
+    def pending(self):
+        """
+        Returns the states remaining to expand
+        """
+        return self.visited.concatenate([self.frontier] + self.next)
+
+    def _meta(self):
+        dynamics = self.dynamics
+        # digest of the source rather than make_hash(), whose DNF conversion
+        # can take exponential time and modifies the expressions in place
+        functions = hashlib.md5(dynamics.model.source().encode()).hexdigest()
+        return {"nodes": [str(a) for a in dynamics.nodes],
+                "levels": [int(m) for m in dynamics.levels],
+                "functions": functions,
+                "update_mode": type(dynamics).__name__,
+                "loops": bool(dynamics.loops)}
+
+    def save(self, filename, **info):
+        """
+        Writes the pending states and the visited states to `filename` (NumPy
+        `.npz` format), together with the JSON-serializable `info`.
+        The file is replaced atomically.
+        """
+        visited = self.visited
+        arrays = {"frontier": visited.pack(self.pending())}
+        if visited.bitmap is not None:
+            arrays["bitmap"] = visited.bitmap
+        else:
+            arrays["states"] = visited.pack(sorted(visited.states))
+        meta = dict(self._meta(), count=visited.count, info=info)
+        arrays["meta"] = np.array(json.dumps(meta))
+        tmp = f"{filename}.tmp"
+        with open(tmp, "wb") as fp:
+            np.savez_compressed(fp, **arrays)
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(tmp, filename)
+
+    @classmethod
+    def load(celf, dynamics, filename):
+        """
+        Returns the pair `(exploration, info)` saved in `filename`.
+        Raises `ValueError` if it has been saved from different dynamics
+        or node functions.
+        """
+        with np.load(filename) as data:
+            meta = json.loads(str(data["meta"]))
+            info = meta.pop("info")
+            count = meta.pop("count")
+            exploration = celf(dynamics, None, _VisitedStates(dynamics.size))
+            if meta != exploration._meta():
+                raise ValueError(f"{filename} has been saved from different "
+                                "dynamics")
+            visited = exploration.visited
+            if visited.bitmap is not None:
+                visited.bitmap = data["bitmap"].copy()
+            else:
+                states = visited.unpack(data["states"])
+                visited.states = set(states if visited.wide
+                                        else states.tolist())
+            visited.count = count
+            exploration.frontier = visited.unpack(data["frontier"])
+        return exploration, info
+
 class UpdateModeDynamics(object):
     """
-    Abstract class for the updating mode of a BooleanNetwork object
+    Abstract class for the updating mode of a BooleanNetwork or
+    MultiValuedNetwork object
+
+    Configurations can be handled either as `dict` objects, or as integers
+    where bit `i` is the value of `self.nodes[i]`.
+    With multi-valued networks, integers are in mixed radix, where the level
+    of `self.nodes[i]` is `s // self.weights[i] % (self.levels[i]+1)`, and
+    nodes change of one level at a time towards the level of their image.
     """
     def __init__(self, model, loops=False):
-        if not isinstance(model, BooleanNetwork):
-            raise TypeError("Only BooleanNetwork objects are supported")
+        if isinstance(model, BooleanNetwork):
+            self.levels = (1,)*len(model)
+        elif isinstance(model, MultiValuedNetwork):
+            self.levels = model.compile().levels
+        else:
+            raise TypeError("Only BooleanNetwork and MultiValuedNetwork "
+                            "objects are supported")
         self.model = model
         self.nodes = tuple(model)
         self.n = len(self.nodes)
         self.loops = loops
+        self._boolean = isinstance(model, BooleanNetwork)
+        self._binary = all(m == 1 for m in self.levels)
+        self.weights = _level_weights(self.levels)
+        self.size = math.prod([m+1 for m in self.levels])
+
+    batch_size = 2**16
+    """
+    Number of states processed at once by :py:meth:`.dynamics`
+    """
+
+    worker_poll_interval = 5
+    """
+    Interval (in seconds) at which the worker processes of a parallel
+    exploration are checked to be still running
+    """
 
     def __call__(self, x):
         """
-        Sub-classes have to implement this method which should return an
-        iterator (or list) over the states following `x`.
+        Sub-classes have to implement this method (or :py:meth:`.successors_int`)
+        which should return an iterator (or list) over the states following `x`.
         """
         raise NotImplementedError
 
+    def encode(self, x):
+        """
+        Returns the integer encoding of configuration `x`
+        """
+        s = 0
+        if self._binary:
+            for i, a in enumerate(self.nodes):
+                if x[a]:
+                    s |= 1 << i
+        else:
+            for a, w in zip(self.nodes, self.weights):
+                s += int(x[a]) * w
+        return s
+
+    def decode(self, s):
+        """
+        Returns the configuration (`dict`) encoded by the integer `s`
+        """
+        if self._binary:
+            return {a: (s >> i) & 1 for i, a in enumerate(self.nodes)}
+        return {a: s // w % (m+1)
+                for a, w, m in zip(self.nodes, self.weights, self.levels)}
+
+    _last = None
+
+    def _image(self, s):
+        """
+        Returns the integer encoding of the image of the state `s`. With
+        Boolean networks, only the targets of the nodes differing from the
+        previously evaluated state are re-evaluated, when they are few.
+        """
+        if not self._boolean:
+            return self.model.compile().step_int(s)
+        try:
+            compiled = self.model.compile()
+        except _COMPILE_ERRORS:
+            # see BooleanNetwork.__call__
+            return self.encode(self.model(self.decode(s)))
+        last = self._last
+        if last is not None and last[0] is compiled:
+            z = compiled.update_int(s, last[2], s ^ last[1])
+        else:
+            z = compiled.step_int(s)
+        self._last = (compiled, s, z)
+        return z
+
+    def _deltas(self, s):
+        """
+        Returns a `dict` associating the index `i` of each unstable node (in
+        increasing order) with the change to add to the state `s` (integer) to
+        update `self.nodes[i]` one level towards the level of its image.
+        """
+        z = self._image(s)
+        deltas = {}
+        if self._binary:
+            D = z ^ s
+            while D:
+                b = D & -D
+                deltas[b.bit_length()-1] = b if z & b else -b
+                D ^= b
+            return deltas
+        for i, (w, m) in enumerate(zip(self.weights, self.levels)):
+            d = z // w % (m+1) - s // w % (m+1)
+            if d:
+                deltas[i] = w if d > 0 else -w
+        return deltas
+
+    def successors_int(self, s):
+        """
+        Returns an iterator (or list) over the integer encodings of the states
+        following the state encoded by `s`.
+        """
+        return [self.encode(y) for y in self(self.decode(s))]
+
+    def transitions_int(self, S):
+        """
+        Returns the transitions from the states of the integer array `S`, as a
+        pair of integer arrays `(sources, targets)`.
+
+        Sub-classes can override this method to compute the transitions of
+        the whole batch at once.
+        """
+        src, dst = [], []
+        for s in S.tolist():
+            for y in self.successors_int(s):
+                if y != s or self.loops:
+                    src.append(s)
+                    dst.append(y)
+        return np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64)
+
+    def _levels_arg(self):
+        return None if self._binary else self.levels
+
+    def _labeller(self, encoding):
+        if encoding == "int":
+            return None
+        elif encoding == "str":
+            if not self.n:
+                return lambda s: ""
+            if not self._binary:
+                return lambda s: "".join([str(v)
+                                    for v in self.decode(s).values()])
+            fmt = "0{}b".format(self.n)
+            return lambda s: format(s, fmt)[::-1]
+        raise ValueError(f"Unknown state encoding {encoding}")
+
+
     def push(self, d, x):
         def fmt(z):
             return "".join([str(z[i]) for i in self.nodes])
@@ -706,6 +3048,20 @@ class UpdateModeDynamics(object):
                 d.add_edge(rx, ry)
         return children
 
+    def push_int(self, d, s, label=None):
+        """
+        Adds the state `s` (integer) and its outgoing transitions to the graph
+        `d`, with node identifiers given by `label` (integers by default).
+        Returns the list of successors of `s`.
+        """
+        children = list(self.successors_int(s))
+        rx = label(s) if label else s
+        d.add_node(rx)
+        for y in children:
+            if y != s or self.loops:
+                d.add_edge(rx, label(y) if label else y)
+        return children
+
     def random_walk(self, init, steps=0, stop_condition=None, stop_at=None):
         if stop_at:
             stop_at = HypercubeCollection.cast(stop_at)
@@ -730,44 +3086,453 @@ class UpdateModeDynamics(object):
             if stop_condition is not None and stop_condition(x):
                 break
 
-    def dynamics(self):
+    def _full_transitions(self, processes=None):
+        """
+        Yields the triplets `(S, sources, targets)` of integer arrays, where
+        `S` covers a range of states, and `(sources, targets)` are their
+        transitions, until covering the full state space.
+
+        With `processes`, the state space is split in shards of consecutive
+        states, which are processed by as many worker processes.
+        """
+        N = self.size
+        if not processes or processes == 1:
+            for start in range(0, N, self.batch_size):
+                S = np.arange(start, min(start + self.batch_size, N),
+                                dtype=np.int64)
+                yield (S,) + tuple(self.transitions_int(S))
+            return
+        shard_size = -(-N // (4*processes))
+        starts = range(0, N, shard_size)
+        stops = [min(start + shard_size, N) for start in starts]
+        with ProcessPoolExecutor(processes, initializer=_init_dynamics_shard,
+                initargs=(self,)) as executor:
+            for start, stop, (src, dst) in zip(starts, stops,
+                    executor.map(_dynamics_shard, starts, stops)):
+                yield np.arange(start, stop, dtype=np.int64), src, dst
+
+    def dynamics(self, encoding="str", backend="networkx", processes=None):
+        """
+        Returns the directed graph of the full dynamics.
+
+        :param encoding: identifiers of the states in the graph: either
+            `"str"` (string of the node values in order), or `"int"` (integer
+            encoding).
+        :param backend: either `"networkx"` (returns a `networkx.DiGraph`
+            object), `"csr"` (returns a :py:class:`.StateTransitionGraph`
+            object), or `"lazy"` (returns a
+            :py:class:`.LazyStateTransitionGraph` object, computing the
+            transitions on demand).
+        :param int processes: if set, the transitions are computed in parallel
+            by that number of worker processes, each one handling ranges of
+            consecutive states.
+        """
+        if backend == "lazy":
+            return LazyStateTransitionGraph(self, encoding)
+        batches = self._full_transitions(processes)
+        if backend == "csr":
+            src, dst = [], []
+            for _, batch_src, batch_dst in batches:
+                src.append(batch_src)
+                dst.append(batch_dst)
+            return StateTransitionGraph(self.nodes,
+                    np.arange(self.size, dtype=np.int64),
+                    np.concatenate(src), np.concatenate(dst), encoding=encoding,
+                    levels=self._levels_arg())
+        elif backend != "networkx":
+            raise ValueError(f"Unknown backend {backend}")
         d = nx.DiGraph()
-        x = {i: 0 for i in self.nodes}
-        self.push(d, x)
-        even = True
-        right = -1
-        for m in range(1,2**self.n):
-            if even:
-                x[self.nodes[0]] = 1-x[self.nodes[0]]
-                for i in range(self.n):
-                    if x[self.nodes[i]]:
-                        right = i
-                        break
-            else:
-                x[self.nodes[right+1]] = 1-x[self.nodes[right+1]]
-                if x[self.nodes[right+1]]:
-                    right = right+1
-            even = not even
-            self.push(d, x)
+        labels = _batch_labeller(self.n, encoding, self._levels_arg())
+        for S, src, dst in batches:
+            d.add_nodes_from(labels(S))
+            d.add_edges_from(zip(labels(src), labels(dst)))
         return d
 
-    def partial_dynamics(self, init):
-        d = nx.DiGraph()
-        def m(x):
-            return tuple([x[i] for i in self.nodes])
-        init = {i: int(init[i]) for i in self.nodes}
-        todo = {m(init)}
-        done = set()
+    def attractors(self, init=None):
+        """
+        Returns the list of attractors (terminal strongly connected components
+        of the dynamics), reachable from the configuration `init` if given,
+        each being either a :py:class:`.State` object (fixed point) or a
+        :py:class:`.HypercubeCollection` object (states of a cyclic
+        attractor).
+
+        Successors are computed on demand: only the Tarjan algorithm
+        bookkeeping is stored in memory, not the transitions.
+        """
+        if init:
+            roots = [self.encode({i: int(init[i]) for i in self.nodes})]
+        else:
+            roots = range(self.size)
+        return [_states_object(self.nodes, scc, self._levels_arg())
+                for scc, terminal in _tarjan(roots, self.successors_int)
+                if terminal]
+
+    def _parallel_reachability(self, s, processes, edges=True):
+        """
+        Breadth-first exploration from the state `s` (integer) by `processes`
+        worker processes, each one owning the states of a hash partition and
+        expanding them, and exchanging the states they reach through queues.
+
+        Returns the triplet `(states, sources, targets)` of integer arrays of
+        the reachable states (sorted) and of their transitions (empty unless
+        `edges` is `True`).
+        """
+        inboxes = [multiprocessing.Queue() for _ in range(processes)]
+        results = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=_reachability_worker,
+                        args=(self, rank, inboxes, results, edges),
+                        daemon=True)
+                    for rank in range(processes)]
+        for worker in workers:
+            worker.start()
+        def collect():
+            msgs = {}
+            while len(msgs) < processes:
+                try:
+                    msg = results.get(timeout=self.worker_poll_interval)
+                except queue.Empty:
+                    for rank, worker in enumerate(workers):
+                        if rank not in msgs and not worker.is_alive():
+                            raise RuntimeError(f"Worker {rank} exited with "
+                                               f"code {worker.exitcode}")
+                    continue
+                if msg[0] == "error":
+                    raise msg[2]
+                msgs[msg[1]] = msg
+            return [msgs[rank] for rank in range(processes)]
+        src, dst = [], []
+        try:
+            owner = _state_owners(np.array([s], dtype=np.int64), processes)[0]
+            inboxes[owner].put(("init", s))
+            while True:
+                for inbox in inboxes:
+                    inbox.put(("expand",))
+                new = 0
+                for _, _, count, batch_src, batch_dst in collect():
+                    new += count
+                    src.append(batch_src)
+                    dst.append(batch_dst)
+                if not new:
+                    break
+            for inbox in inboxes:
+                inbox.put(("stop",))
+            states = np.sort(np.concatenate([msg[2]
+                                for msg in collect()]))
+        finally:
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+                worker.join()
+        return states, np.concatenate(src), np.concatenate(dst)
+
+    def _wide(self):
+        return self.size > 2**62
+
+    def _batch_transitions(self, S, wide=False):
+        """
+        Returns the transitions from the states `S` as with
+        :py:meth:`.transitions_int`, or as lists of integers when `wide`
+        (see :py:class:`._VisitedStates`)
+        """
+        if not wide:
+            return self.transitions_int(np.asarray(S, dtype=np.int64))
+        src, dst = [], []
+        for s in S:
+            for y in self.successors_int(s):
+                if y != s or self.loops:
+                    src.append(s)
+                    dst.append(y)
+        return src, dst
+
+    def _target_matcher(self, target):
+        """
+        Returns the function selecting the states of an integer array which
+        match `target`: a configuration, partial configuration, or hypercube
+        (`dict` associating nodes with a level, `"*"`, or a collection of
+        levels), or a list of them.
+        """
+        cubes = [target] if isinstance(target, dict) else list(target)
+        index = {a: i for i, a in enumerate(self.nodes)}
+        constraints = []
+        for h in cubes:
+            c = []
+            for a, v in h.items():
+                if v == "*":
+                    continue
+                i = index[a]
+                allowed = [int(v)] if isinstance(v, (int, np.integer)) \
+                            else sorted(v)
+                c.append((self.weights[i], self.levels[i]+1, allowed))
+            constraints.append(c)
+        def match(S):
+            M = np.zeros(len(S), dtype=bool)
+            for c in constraints:
+                m = np.ones(len(S), dtype=bool)
+                for w, radix, allowed in c:
+                    m &= np.isin(S // w % radix, allowed)
+                M |= m
+            return S[M]
+        return match
+
+    def reachable(self, init, target, witness=False):
+        """
+        Returns whether a state matching `target` is reachable from the
+        configuration `init`.
+
+        The states are explored in breadth-first order, by batches, until
+        finding a state matching `target`.
+
+        :param target: a configuration, a partial configuration, a
+            :py:class:`.Hypercube` (`dict` associating nodes with a level or
+            `"*"`), or a list of them (e.g.,
+            :py:class:`.HypercubeCollection`).
+        :param bool witness: if `True`, returns instead a shortest path (list
+            of configurations) from `init` to a state matching `target`, or
+            `None` if there is none.
+        """
+        match = self._target_matcher(target)
+        visited = _VisitedStates(self.size)
+        wide = visited.wide
+        def array(S):
+            return np.array(S, dtype=object if wide else np.int64)
+        s = self.encode({i: int(init[i]) for i in self.nodes})
+        frontier = visited.add_new([s])
+        levels = []
+        found = match(array([s]))
+        while not len(found) and len(frontier):
+            next_frontier = []
+            level = []
+            for b in range(0, len(frontier), self.batch_size):
+                src, dst = self._batch_transitions(
+                                frontier[b:b+self.batch_size], wide)
+                new = visited.add_new(dst)
+                next_frontier.append(new)
+                if witness:
+                    if wide:
+                        parents = {}
+                        for u, v in zip(src, dst):
+                            parents.setdefault(v, u)
+                        level.append((new, [parents[v] for v in new]))
+                    else:
+                        T, first = np.unique(dst, return_index=True)
+                        sel = np.isin(T, new, assume_unique=True)
+                        level.append((new, src[first[sel]]))
+                found = match(array(new))
+                if len(found):
+                    break
+            levels.append(level)
+            frontier = visited.concatenate(next_frontier)
+        if not witness:
+            return bool(len(found))
+        if not len(found):
+            return None
+        path = [int(found[0]) if not wide else found[0]]
+        for level in reversed(levels):
+            s = path[-1]
+            for states, parents in level:
+                j = bisect.bisect_left(states, s) if wide else \
+                    int(np.searchsorted(states, s))
+                if j < len(states) and states[j] == s:
+                    path.append(int(parents[j]))
+                    break
+        return [self.decode(s) for s in reversed(path)]
+
+    def reachable_states(self, init, processes=None):
+        """
+        Returns the sorted array of the integer encodings of the states
+        reachable from the configuration `init`.
+
+        :param int processes: if set, the exploration is made by that number
+            of worker processes (see :py:meth:`.partial_dynamics`).
+        """
+        if processes and processes > 1 and not self._wide():
+            s = self.encode({i: int(init[i]) for i in self.nodes})
+            return self._parallel_reachability(s, processes, edges=False)[0]
+        exploration = _Exploration.start(self, init)
+        for _ in exploration.transitions():
+            pass
+        return exploration.visited.sorted_states()
+
+    def basins(self, labels=False, processes=None):
+        """
+        Returns the attractors and the sizes of their basins, computed on the
+        compact graph of the full dynamics (see
+        :py:meth:`.StateTransitionGraph.basins`); with `labels`, the label
+        of the state encoded by `s` is `labels[s]`.
+
+        :param int processes: see :py:meth:`.dynamics`
+        """
+        return self.dynamics(encoding="int", backend="csr",
+                    processes=processes).basins(labels)
+
+    def partial_dynamics(self, init, encoding="str", backend="networkx",
+            processes=None):
+        """
+        Returns the directed graph of the dynamics reachable from the
+        configuration `init`.
+
+        :param encoding: see :py:meth:`.dynamics`
+        :param backend: see :py:meth:`.dynamics`; with `"lazy"`, the
+            returned view covers all the states.
+        :param int processes: if set, the reachable states are explored by
+            that number of worker processes, each one owning the states of a
+            partition made by hashing the integer encodings, and sending to
+            the others the states they reach (up to 2**62 states).
+        """
+        if backend == "lazy":
+            return LazyStateTransitionGraph(self, encoding)
+        if processes and processes > 1 and not self._wide() \
+                and backend in ("csr", "networkx"):
+            s = self.encode({i: int(init[i]) for i in self.nodes})
+            states, src, dst = self._parallel_reachability(s, processes)
+            if backend == "csr":
+                return StateTransitionGraph(self.nodes, states, src, dst,
+                        encoding=encoding, levels=self._levels_arg())
+            d = nx.DiGraph()
+            labels = _batch_labeller(self.n, encoding, self._levels_arg())
+            d.add_nodes_from(labels(states))
+            d.add_edges_from(zip(labels(src), labels(dst)))
+            return d
+        if backend == "csr":
+            src, dst = [], []
+            def push(s):
+                children = list(self.successors_int(s))
+                for y in children:
+                    if y != s or self.loops:
+                        src.append(s)
+                        dst.append(y)
+                return children
+        elif backend == "networkx":
+            d = nx.DiGraph()
+            label = self._labeller(encoding)
+            def push(s):
+                return self.push_int(d, s, label)
+        else:
+            raise ValueError(f"Unknown backend {backend}")
+        s = self.encode({i: int(init[i]) for i in self.nodes})
+        todo = [s]
+        done = {s}
         while todo:
-            mx = todo.pop()
-            x = dict(zip(self.nodes, mx))
-            done.add(mx)
-            for y in self.push(d, x):
-                my = m(y)
-                if my not in done:
-                    todo.add(my)
+            s = todo.pop()
+            for y in push(s):
+                if y not in done:
+                    done.add(y)
+                    todo.append(y)
+        if backend == "csr":
+            return StateTransitionGraph(self.nodes, sorted(done),
+                    np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64),
+                    encoding=encoding, levels=self._levels_arg())
         return d
 
+    def _stream(self, exploration, checkpoint, checkpoint_interval, info):
+        """
+        Yields the batches of transitions of `exploration`, saving it to the
+        file `checkpoint` (if set) every `checkpoint_interval` seconds and at
+        the end, with the information returned by `info()`.
+        """
+        last = time.monotonic()
+        for batch in exploration.transitions():
+            yield batch
+            if checkpoint and time.monotonic() - last >= checkpoint_interval:
+                exploration.save(checkpoint, **info())
+                last = time.monotonic()
+        if checkpoint:
+            exploration.save(checkpoint, **info())
+
+    def _labels(self, encoding, wide=False):
+        """
+        Returns the function labelling the states of an array, or of a list
+        when `wide` (see :py:class:`._VisitedStates`)
+        """
+        if not wide:
+            return _batch_labeller(self.n, encoding, self._levels_arg())
+        label = self._labeller(encoding) or (lambda s: s)
+        return lambda S: list(map(label, S))
+
+    def _start_exploration(self, init, checkpoint, resume):
+        if resume:
+            if not checkpoint:
+                raise ValueError("resume requires a checkpoint file")
+            return _Exploration.load(self, checkpoint)
+        return _Exploration.start(self, init), {}
+
+    def stream_partial_dynamics(self, init, encoding="str", batches=False,
+            checkpoint=None, checkpoint_interval=600, resume=False):
+        """
+        Yields the transitions `(source, target)` of the dynamics reachable
+        from the configuration `init`, in breadth-first order, without storing
+        them.
+
+        The visited states are recorded in a bitmap when there are at most
+        2**32 states (using at most 512MB), and in a set of integers
+        otherwise.
+
+        :param encoding: see :py:meth:`.dynamics`
+        :param bool batches: if `True`, yields instead pairs of integer arrays
+            `(sources, targets)` of transitions.
+        :param str checkpoint: if set, the visited states and the states
+            remaining to expand are saved in this file every
+            `checkpoint_interval` seconds, and when the exploration is
+            complete.
+        :param bool resume: if `True`, the exploration is resumed from the
+            file `checkpoint` (`init` is then ignored); the transitions
+            yielded after the last save are yielded again.
+        """
+        exploration, _ = self._start_exploration(init, checkpoint, resume)
+        labels = self._labels(encoding, exploration.visited.wide)
+        for src, dst in self._stream(exploration, checkpoint,
+                                     checkpoint_interval, dict):
+            if batches:
+                yield src, dst
+            else:
+                yield from zip(labels(src), labels(dst))
+
+    def resume_partial_dynamics(self, checkpoint, **kwargs):
+        """
+        Resumes the exploration saved in the file `checkpoint` by
+        :py:meth:`.stream_partial_dynamics`, which accepts the same keyword
+        arguments.
+        """
+        return self.stream_partial_dynamics(None, checkpoint=checkpoint,
+                                            resume=True, **kwargs)
+
+    def write_partial_dynamics(self, init, filename, encoding="str",
+            checkpoint=None, checkpoint_interval=600, resume=False):
+        """
+        Writes the transitions of the dynamics reachable from the configuration
+        `init` to the file `filename`, one `source target` line per
+        transition, as they are computed (see
+        :py:meth:`.stream_partial_dynamics` for the other parameters).
+        The file can be read with `networkx.read_edgelist`.
+
+        With `checkpoint`, the position in `filename` is saved along with the
+        exploration, and `resume=True` continues writing from there.
+
+        Returns the number of written transitions.
+        """
+        exploration, info = self._start_exploration(init, checkpoint, resume)
+        if resume and "offset" not in info:
+            raise ValueError(f"{checkpoint} has not been saved by "
+                            "write_partial_dynamics")
+        count = info.get("count", 0)
+        fp = open(filename, "r+" if resume else "w")
+        with fp:
+            if resume:
+                fp.seek(info["offset"])
+                fp.truncate()
+                encoding = info["encoding"]
+            def state():
+                fp.flush()
+                return {"offset": fp.tell(), "count": count,
+                        "encoding": encoding}
+            labels = self._labels(encoding, exploration.visited.wide)
+            for src, dst in self._stream(exploration, checkpoint,
+                                         checkpoint_interval, state):
+                fp.writelines([f"{u} {v}\n"
+                               for u, v in zip(labels(src), labels(dst))])
+                count += len(src)
+        return count
+
 class ElementaryUpdateModeDynamics(UpdateModeDynamics):
     def __init__(self, model, min_u, max_u, **opts):
         super().__init__(model, **opts)
@@ -775,17 +3540,52 @@ class ElementaryUpdateModeDynamics(UpdateModeDynamics):
         self.max_u = max_u
 
     def __call__(self, x):
-        z = self.model(x)
-        for k in range(self.min_u, self.max_u+1):
-            for I in itertools.combinations(self.nodes, k):
-                y = x.copy()
-                mod = False or self.loops
-                for i in I:
-                    if z[i] != y[i]:
-                        mod = True
-                    y[i] = z[i]
-                if mod:
-                    yield y
+        for t in self.successors_int(self.encode(x)):
+            y = x.copy()
+            y.update(self.decode(t))
+            yield y
+
+    def successors_int(self, s):
+        """
+        Yields the distinct successors of `s`, by updating the subsets of
+        unstable nodes which can be completed with stable nodes to reach a
+        number of updated nodes between `min_u` and `max_u`.
+        """
+        deltas = list(self._deltas(s).values())
+        u = len(deltas)
+        for k in range(max(self.min_u - (self.n - u), 0), min(self.max_u, u)+1):
+            if not k:
+                if self.loops:
+                    yield s
+                continue
+            for D in itertools.combinations(deltas, k):
+                yield s + sum(D)
+
+    def transitions_int(self, S):
+        n = self.n
+        if not n or not self._boolean or self.min_u != self.max_u \
+                or self.min_u not in (1, n):
+            return super().transitions_int(S)
+        try:
+            Z = self.model.compile().step_int_batch(S)
+        except _COMPILE_ERRORS:
+            return super().transitions_int(S)
+        if self.min_u == n:
+            if not self.loops:
+                sel = Z != S
+                S, Z = S[sel], Z[sel]
+            return S, Z
+        D = Z ^ S
+        src, dst = [], []
+        for b in self.weights:
+            sel = (D & b) != 0
+            src.append(S[sel])
+            dst.append(S[sel] ^ b)
+        if self.loops:
+            sel = D != (1 << n) - 1
+            src.append(S[sel])
+            dst.append(S[sel])
+        return np.concatenate(src), np.concatenate(dst)
 
 class FullyAsynchronousDynamics(ElementaryUpdateModeDynamics):
     def __init__(self, model, **opts):
@@ -816,14 +3616,42 @@ class PeriodicDynamics(UpdateModeDynamics):
                 return {I}
             return I
         self.sequence = tuple(map(magic, sequence))
+        self._masks = tuple(self.encode({a: a in I for a in self.nodes})
+                for I in self.sequence) if self._binary else None
+        self._blocks = tuple(tuple(i for i, a in enumerate(self.nodes) if a in I)
+                for I in self.sequence)
 
     def __call__(self, x):
-        y = x.copy()
-        for I in self.sequence:
-            z = self.model(y)
-            for i in I:
-                y[i] = z[i]
-        yield y
+        for t in self.successors_int(self.encode(x)):
+            y = x.copy()
+            y.update(self.decode(t))
+            yield y
+
+    def successors_int(self, s):
+        if not self._binary:
+            for block in self._blocks:
+                deltas = self._deltas(s)
+                s += sum(deltas.get(i, 0) for i in block)
+            yield s
+            return
+        for mask in self._masks:
+            s = (s & ~mask) | (self._image(s) & mask)
+        yield s
+
+    def transitions_int(self, S):
+        if not self._boolean:
+            return super().transitions_int(S)
+        try:
+            step_int_batch = self.model.compile().step_int_batch
+        except _COMPILE_ERRORS:
+            return super().transitions_int(S)
+        Y = S
+        for mask in self._masks:
+            Y = (Y & ~mask) | (step_int_batch(Y) & mask)
+        if not self.loops:
+            sel = Y != S
+            S, Y = S[sel], Y[sel]
+        return S, Y
 
 class BlockSequentialDynamics(PeriodicDynamics):
     pass
@@ -19,6 +19,7 @@ See https://github.com/colomoto/colomoto-jupyter
         "beautifulsoup4",
         "boolean.py",
         "networkx >= 2.0",
+        "numpy",
         "pandas",
         "pydot",
     ],
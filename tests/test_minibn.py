@@ -16,3 +16,537 @@ class TestConversions(unittest.TestCase):
             return
         bn = bn1()
         pybn = bn.to_pyboolnet()
+
+def bn2():
+    return minibn.BooleanNetwork({
+            "a": "!b & c",
+            "b": "a | !c",
+            "c": "c",
+            "d": "0",
+        })
+
+class UncompiledNetwork(minibn.BooleanNetwork):
+    def _compile(self):
+        raise RecursionError
+
+def all_states(bn):
+    import itertools
+    for v in itertools.product([0,1], repeat=len(bn)):
+        yield dict(zip(bn, v))
+
+class TestCompile(unittest.TestCase):
+    def test_step(self):
+        bn = bn2()
+        c = bn.compile()
+        for x in all_states(bn):
+            y = {a: int(f(**x)) for a, f in bn.items()}
+            self.assertEqual(bn(x), y)
+            self.assertEqual(c.decode(c.step_int(c.encode(x))), y)
+
+    def test_deep_nesting(self):
+        f = "a"
+        for i in range(150):
+            f = f"b & ({f})" if i % 2 else f"!a | ({f})"
+        bn = minibn.BooleanNetwork({"a": f, "b": "!(!(!(!(a))))"})
+        for x in all_states(bn):
+            self.assertEqual(bn(x), {a: int(g(**x)) for a, g in bn.items()})
+
+    def test_large_network(self):
+        n = 3000
+        bn = minibn.BooleanNetwork({f"x{i}": f"x{i-1}" if i else "1"
+                                    for i in range(n)})
+        c = bn.compile()
+        self.assertEqual(c.step_int(0), 1)
+        self.assertEqual(c.step_int(2**n - 1), 2**n - 1)
+        bn2_ = bn.copy()
+        bn2_["x0"] = "0"
+        self.assertEqual(bn2_.compile().step_int(1), 2)
+        mn = minibn.MultiValuedNetwork("".join([f"x{i}:1 <- x{i-1}\n" if i
+                                    else "x0:1 <- 1\n" for i in range(n)]))
+        self.assertEqual(mn.compile().step_int(0), 1)
+        bn = minibn.BooleanNetwork({"a": "c", "b": "a"})
+        self.assertRaises(ValueError, bn.compile)
+        self.assertEqual(bn({"a": 0, "b": 1, "c": 1}), {"a": 1, "b": 0})
+        self.assertIsInstance(bn._compile_error, ValueError)
+        bn["a"] = "b"
+        self.assertEqual(bn.compile().nodes, ("a", "b"))
+
+    def test_update_int(self):
+        bn = bn2()
+        c = bn.compile()
+        c.flip_ratio = 1
+        for s in range(16):
+            for mask in range(16):
+                self.assertEqual(c.update_int(s, c.step_int(s ^ mask), mask),
+                                c.step_int(s))
+
+    def test_invalidate(self):
+        bn = bn2()
+        c = bn.compile()
+        self.assertIs(bn.compile(), c)
+        bn["c"] = "a"
+        self.assertIsNot(bn.compile(), c)
+        bn.rename("d", "e")
+        self.assertEqual(bn.compile().nodes, tuple(bn))
+
+class TestDynamics(unittest.TestCase):
+    def test_int_encoding(self):
+        bn = bn2()
+        for update_mode in ["asynchronous", "general", "synchronous"]:
+            d = bn.dynamics(update_mode)
+            di = bn.dynamics(update_mode, encoding="int")
+            def label(s):
+                return "".join([str((s >> i) & 1) for i in range(len(bn))])
+            self.assertEqual(set(d.edges()),
+                    {(label(x), label(y)) for (x, y) in di.edges()})
+            init = {"a": 0, "b": 0, "c": 1, "d": 0}
+            d = bn.dynamics(update_mode, init=init)
+            di = bn.dynamics(update_mode, init=init, encoding="int")
+            self.assertEqual(set(d.nodes()), set(map(label, di.nodes())))
+
+    def test_unstable_successors(self):
+        bn = bn2()
+        s = minibn.GeneralAsynchronousDynamics(bn).encode(
+                {"a": 1, "b": 0, "c": 1, "d": 1})
+        for loops in [False, True]:
+            for cls in [minibn.FullyAsynchronousDynamics,
+                        minibn.GeneralAsynchronousDynamics,
+                        minibn.SynchronousDynamics]:
+                succ = list(cls(bn, loops=loops).successors_int(s))
+                self.assertEqual(len(succ), len(set(succ)))
+        g = minibn.GeneralAsynchronousDynamics(bn)
+        self.assertEqual(sorted(g.successors_int(s)), [5, 7, 15])
+        self.assertEqual(sorted(minibn.GeneralAsynchronousDynamics(bn, loops=True)
+                                    .successors_int(s)), [5, 7, 13, 15])
+        chain = minibn.BooleanNetwork({f"x{i}": f"x{i-1}" if i else "1"
+                                        for i in range(40)})
+        d = chain.dynamics("general", init={a: 0 for a in chain})
+        self.assertEqual(len(d), 41)
+
+    def test_uncompiled(self):
+        bn = bn2()
+        un = UncompiledNetwork(bn.source())
+        init = {"a": 0, "b": 0, "c": 1, "d": 0}
+        for update_mode in ["asynchronous", "general", "synchronous"]:
+            self.assertEqual(set(un.dynamics(update_mode).edges()),
+                             set(bn.dynamics(update_mode).edges()))
+        d = minibn.BlockSequentialDynamics([["a", "b"], "c", "d"], un)
+        self.assertEqual(set(d.dynamics().edges()), set(
+            minibn.BlockSequentialDynamics([["a", "b"], "c", "d"], bn)
+                .dynamics().edges()))
+        self.assertEqual(list(minibn.SyncRun(un, init, 3)),
+                         list(minibn.SyncRun(bn, init, 3)))
+        self.assertEqual(list(minibn.FAsyncRun(un, init, 5, seed=0)),
+                         list(minibn.FAsyncRun(bn, init, 5, seed=0)))
+
+    def test_lazy(self):
+        import networkx as nx
+        bn = bn2()
+        for update_mode in ["asynchronous", "general", "synchronous"]:
+            d = bn.dynamics(update_mode)
+            g = bn.dynamics(update_mode, backend="lazy")
+            for x in d.nodes():
+                self.assertEqual(set(g.successors(x)), set(d.successors(x)))
+        self.assertTrue(g.has_node("0010"))
+        for x in ["0012", "001", "001a"]:
+            self.assertFalse(g.has_node(x))
+            self.assertRaises(KeyError, g.successors, x)
+        init = {"a": 0, "b": 0, "c": 1, "d": 0}
+        g = bn.dynamics("asynchronous", backend="lazy", encoding="int")
+        g.cache_size = 2
+        self.assertEqual(g.size, 16)
+        self.assertEqual(g.number_of_nodes(), 16)
+        self.assertTrue(g.has_edge(init, 5))
+        self.assertFalse(g.has_edge(init, 6))
+        self.assertEqual(list(g.bfs_layers(init)), [[4], [5], [7], [6]])
+        self.assertEqual(g.shortest_path(init, 6), [4, 5, 7, 6])
+        self.assertEqual(list(g.bfs_edges(init, depth_limit=1)), [(4, 5)])
+        self.assertRaises(nx.NetworkXNoPath, g.shortest_path, 2, 4)
+        self.assertLessEqual(len(g._cache), 2)
+        chain = minibn.BooleanNetwork({f"x{i}": f"x{i-1}" if i else "1"
+                                        for i in range(70)})
+        g = chain.dynamics("asynchronous", backend="lazy")
+        self.assertEqual(g.number_of_nodes(), 2**70)
+        self.assertEqual(g.successors("0"*70), ["1" + "0"*69])
+
+    def test_stream(self):
+        import os, tempfile
+        import networkx as nx
+        bn = bn2()
+        init = {"a": 0, "b": 0, "c": 1, "d": 0}
+        for update_mode in ["asynchronous", "general", "synchronous"]:
+            dyn = bn._update_mode_dynamics(update_mode)
+            d = dyn.partial_dynamics(init)
+            edges = list(dyn.stream_partial_dynamics(init))
+            self.assertEqual(len(edges), len(set(edges)))
+            self.assertEqual(set(edges), set(d.edges()))
+        fd, filename = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            self.assertEqual(dyn.write_partial_dynamics(init, filename),
+                                d.number_of_edges())
+            g = nx.read_edgelist(filename, create_using=nx.DiGraph)
+            self.assertEqual(set(g.edges()), set(d.edges()))
+        finally:
+            os.unlink(filename)
+
+    def test_checkpoint(self):
+        import os, tempfile
+        bn = bn2()
+        bn["d"] = "!d"
+        init = {"a": 0, "b": 0, "c": 1, "d": 0}
+        dyn = minibn.GeneralAsynchronousDynamics(bn)
+        dyn.batch_size = 1
+        edges = set(dyn.stream_partial_dynamics(init))
+        tmpdir = tempfile.mkdtemp()
+        checkpoint = os.path.join(tmpdir, "checkpoint.npz")
+        filename = os.path.join(tmpdir, "edges.txt")
+        try:
+            stream = dyn.stream_partial_dynamics(init, batches=True,
+                    checkpoint=checkpoint, checkpoint_interval=0)
+            next(stream)
+            next(stream)
+            stream.close()
+            resumed = list(dyn.resume_partial_dynamics(checkpoint))
+            self.assertEqual(len(resumed), len(set(resumed)))
+            self.assertLess(len(resumed), len(edges))
+            self.assertTrue(set(resumed) < edges)
+            self.assertEqual(list(dyn.resume_partial_dynamics(checkpoint)), [])
+            self.assertRaises(ValueError, list,
+                minibn.SynchronousDynamics(bn).resume_partial_dynamics(checkpoint))
+            other = bn.copy()
+            other["c"] = "!c"
+            self.assertRaises(ValueError, list, minibn.GeneralAsynchronousDynamics(
+                                other).resume_partial_dynamics(checkpoint))
+            self.assertRaises(ValueError, dyn.write_partial_dynamics, None,
+                              filename, checkpoint=checkpoint, resume=True)
+            os.unlink(checkpoint)
+            self.assertEqual(dyn.write_partial_dynamics(init, filename,
+                    checkpoint=checkpoint), len(edges))
+            with open(filename, "a") as fp:
+                fp.write("garbage\n")
+            self.assertEqual(dyn.write_partial_dynamics(None, filename,
+                    checkpoint=checkpoint, resume=True), len(edges))
+            with open(filename) as fp:
+                self.assertEqual({tuple(l.split()) for l in fp}, edges)
+            bn = minibn.BooleanNetwork({"a": "a | (b & (c | (d & a)))",
+                                        "b": "b", "c": "c", "d": "d"})
+            bn.simplify(in_place=True)
+            source = bn.source()
+            list(minibn.SynchronousDynamics(bn).stream_partial_dynamics(
+                    init, checkpoint=checkpoint))
+            self.assertEqual(bn.source(), source)
+        finally:
+            for f in os.listdir(tmpdir):
+                os.unlink(os.path.join(tmpdir, f))
+            os.rmdir(tmpdir)
+
+class TestBatch(unittest.TestCase):
+    def test_evaluate_batch(self):
+        import numpy as np
+        bn = bn2()
+        X = np.array([list(x.values()) for x in all_states(bn)], dtype=np.uint8)
+        Y = bn.evaluate_batch(X)
+        self.assertEqual(Y.dtype, X.dtype)
+        for x, y in zip(X, Y):
+            self.assertEqual(bn(dict(zip(bn, x))), dict(zip(bn, y)))
+
+    def test_csr_backend(self):
+        bn = bn2()
+        for update_mode in ["asynchronous", "general", "synchronous"]:
+            d = bn.dynamics(update_mode)
+            g = bn.dynamics(update_mode, backend="csr")
+            self.assertEqual(set(g.to_networkx().edges()), set(d.edges()))
+            self.assertEqual(set(g.to_networkx().nodes()), set(d.nodes()))
+        g = bn.dynamics("asynchronous", backend="csr")
+        attractors = g.attractors()
+        self.assertIn({"a": 0, "b": 1, "c": 0, "d": 0}, attractors)
+        self.assertEqual(len(attractors), 2)
+
+    def test_parallel(self):
+        bn = bn2()
+        for update_mode in ["asynchronous", "synchronous"]:
+            d = bn.dynamics(update_mode)
+            dp = bn.dynamics(update_mode, processes=2)
+            self.assertEqual(set(d.edges()), set(dp.edges()))
+            self.assertEqual(set(d.nodes()), set(dp.nodes()))
+        init = {"a": 0, "b": 0, "c": 1, "d": 0}
+        for update_mode in ["asynchronous", "general"]:
+            d = bn.dynamics(update_mode, init=init)
+            dp = bn.dynamics(update_mode, init=init, processes=2)
+            self.assertEqual(set(d.edges()), set(dp.edges()))
+            self.assertEqual(set(d.nodes()), set(dp.nodes()))
+        dyn = minibn.FullyAsynchronousDynamics(bn)
+        self.assertEqual(dyn.reachable_states(init, processes=3).tolist(),
+                        [4, 5, 6, 7])
+        self.assertEqual(dyn.reachable_states(init).tolist(), [4, 5, 6, 7])
+        dyn = CrashingDynamics(bn)
+        dyn.worker_poll_interval = 0.1
+        self.assertRaises(RuntimeError, dyn.reachable_states, init, processes=2)
+
+class CrashingDynamics(minibn.FullyAsynchronousDynamics):
+    def transitions_int(self, S):
+        import os
+        os._exit(1)
+
+class TestNetwork(unittest.TestCase):
+    def test_pickle(self):
+        import pickle
+        bn = bn2()
+        bn.compile()
+        bn2_ = pickle.loads(pickle.dumps(bn))
+        self.assertEqual(bn2_, bn)
+        self.assertIs(bn2_["d"], bn2_.ba.FALSE)
+        self.assertEqual(bn2_.compile().source, bn.compile().source)
+
+    def test_attractors(self):
+        from colomoto.types import State, HypercubeCollection
+        bn = bn2()
+        attractors = bn.attractors()
+        self.assertEqual(len(attractors), 2)
+        fp = [a for a in attractors if isinstance(a, State)]
+        self.assertEqual(fp, [{"a": 0, "b": 1, "c": 0, "d": 0}])
+        cycles = [a for a in attractors if isinstance(a, HypercubeCollection)]
+        self.assertEqual(cycles[0].count(), 4)
+        attractors = bn.attractors(init={"a": 0, "b": 0, "c": 0, "d": 1})
+        self.assertEqual(attractors, fp)
+        self.assertEqual(len(bn.attractors("synchronous")), 2)
+
+    def test_basins(self):
+        from colomoto.types import State
+        bn = bn2()
+        attractors, sizes, labels = bn.basins(labels=True)
+        self.assertEqual(attractors, bn.attractors())
+        fp = [i for i, a in enumerate(attractors) if isinstance(a, State)][0]
+        self.assertEqual(sizes.tolist(), [8, 8])
+        self.assertEqual(labels[4], 1-fp)
+        self.assertEqual(labels.tolist().count(fp), 8)
+        attractors, sizes = bn.basins("synchronous")
+        self.assertEqual(sizes.sum(), 16)
+        self.assertEqual(sorted(map(str, attractors)),
+                         sorted(map(str, bn.attractors("synchronous"))))
+
+    def test_reachable(self):
+        from colomoto.types import Hypercube, HypercubeCollection
+        bn = bn2()
+        init = {"a": 0, "b": 0, "c": 1, "d": 0}
+        self.assertTrue(bn.reachable(init, {"a": 1, "b": 1}))
+        self.assertFalse(bn.reachable(init, {"c": 0}))
+        self.assertFalse(bn.reachable(init, Hypercube(a="*", b="*", c=1, d=1)))
+        self.assertEqual(bn.reachable(init, {"b": 1, "a": 0}, witness=True),
+                [init, {"a": 1, "b": 0, "c": 1, "d": 0},
+                       {"a": 1, "b": 1, "c": 1, "d": 0},
+                       {"a": 0, "b": 1, "c": 1, "d": 0}])
+        self.assertEqual(bn.reachable(init, HypercubeCollection([
+                            Hypercube(a=0, b=0, c=0, d="*"),
+                            Hypercube(a=1, b=1, c="*", d=0)]), witness=True)[-1],
+                        {"a": 1, "b": 1, "c": 1, "d": 0})
+        self.assertIsNone(bn.reachable(init, {"d": 1}, witness=True))
+        self.assertEqual(bn.reachable(init, init, "synchronous", witness=True),
+                        [init])
+
+    def test_fixpoints(self):
+        bn = bn2()
+        fixpoints = [x for x in all_states(bn) if bn(x) == x]
+        self.assertEqual(sorted(map(sorted, bn.fixpoints())),
+                sorted(map(sorted, fixpoints)))
+        bn = minibn.BooleanNetwork({"a": "!b", "b": "!a", "c": "a & b"})
+        self.assertEqual(len(bn.fixpoints()), 2)
+        self.assertEqual(len(bn.fixpoints(limit=1)), 1)
+        f = "c"
+        for i in range(250):
+            f = f"b & ({f})" if i % 2 else f"!a | ({f})"
+        bn = minibn.BooleanNetwork({"a": "b", "b": "a", "c": f})
+        fixpoints = [x for x in all_states(bn) if bn(x) == x]
+        self.assertEqual(sorted(map(sorted, bn.fixpoints())),
+                sorted(map(sorted, fixpoints)))
+
+    def test_dependencies(self):
+        bn = bn2()
+        self.assertEqual(bn.regulators("a"), {"b", "c"})
+        self.assertEqual(bn.targets("c"), {"a", "b", "c"})
+        self.assertEqual(bn.influences("b"), {("a", 1), ("c", -1)})
+        bn["b"] = "d"
+        self.assertEqual(bn.targets("c"), {"a", "c"})
+        self.assertEqual(bn.targets("d"), {"b"})
+        del bn["a"]
+        self.assertEqual(bn.targets("c"), {"c"})
+        ig = bn.influence_graph()
+        self.assertEqual(set(ig.edges()), {("d", "b"), ("c", "c")})
+
+    def test_propagate_constants(self):
+        bn = minibn.BooleanNetwork({"a": "0", "b": "a | c", "c": "!b",
+                                    "d": "b & !b", "e": "d | c"})
+        bn.propagate_constants()
+        self.assertEqual(bn.constants(), {"a": bn.ba.FALSE, "d": bn.ba.FALSE})
+        self.assertEqual(bn["b"], bn.v("c"))
+        self.assertEqual(bn["e"], bn.v("c"))
+        bn = minibn.BooleanNetwork({"x0": "!x0 & x1",
+            "x1": "!((x2 & x1 & !x4) & x1 & (x3 & !x2)) & (!x1 & (x2 & x3))",
+            "x2": "x2 | ((x1 | x3) & 1 & (x1 & !x0)) | ((x0 & x3) | (x4 & x4)"
+                  " | !(!x0 | !x2 | x4))",
+            "x3": "!((!x1 | (!x4 | !x1 | x1) | x4) & ((x4 | !x0 | x2) | x4))",
+            "x4": "1", "y": "x3 | x0"})
+        bn.propagate_constants()
+        self.assertEqual(bn.constants(), {"x0": bn.ba.FALSE,
+            "x1": bn.ba.FALSE, "x2": bn.ba.TRUE, "x3": bn.ba.FALSE,
+            "x4": bn.ba.TRUE, "y": bn.ba.FALSE})
+
+    def test_rename(self):
+        bn = bn2()
+        bn.rename("c", "z")
+        self.assertEqual(bn.regulators("a"), {"b", "z"})
+        self.assertEqual(bn.targets("c"), set())
+        self.assertEqual(bn["z"], bn.v("z"))
+        bn = minibn.BooleanNetwork({"a.b": "c-d", "c-d": "!a.b & e", "e": "e"})
+        self.assertEqual(bn.sanitize_names(), {"a.b": "a_b", "c-d": "c_d"})
+        self.assertEqual(bn.regulators("c_d"), {"a_b", "e"})
+        self.assertEqual(bn.targets("e"), {"c_d", "e"})
+
+    def test_parse(self):
+        import boolean
+        bn = minibn.BooleanNetwork()
+        for expr in ["a & !b | c", "!(a | b) * c + 1", "a and not (b or false)",
+                     "a & b & c", "(a & b) & c", "[a|b]&!!c"]:
+            self.assertEqual(repr(bn._parse(expr)),
+                             repr(boolean.BooleanAlgebra.parse(bn.ba, expr)))
+        self.assertIs(bn._parse("a | b").args[0], bn._parse("!a").args[0])
+        self.assertIs(bn._parse("("*300 + "a" + ")"*300), bn._parse("a"))
+        f = bn._parse("!("*300 + "a & b" + ")"*300)
+        for _ in range(300):
+            self.assertIsInstance(f, bn.ba.NOT)
+            f = f.args[0]
+        self.assertIs(f, bn._parse("a & b"))
+        f = bn._parse("a & (b | "*300 + "c" + ")"*300)
+        for _ in range(300):
+            self.assertIsInstance(f.args[1], bn.ba.OR)
+            f = f.args[1].args[1]
+        self.assertIs(f, bn._parse("c"))
+        bn = minibn.BooleanNetwork("targets, factors\na, b\nb, a & !c\n\nc, 1\n")
+        self.assertEqual(bn.regulators("b"), {"a", "c"})
+        with self.assertRaises(minibn.ParseError) as cm:
+            minibn.BooleanNetwork("a, b\nb, a &\n")
+        self.assertEqual(cm.exception.lineno, 2)
+        mn = minibn.MultiValuedNetwork("a:1 <- b:2\nb:1 <- a\nb:2 <- a & b:1\n")
+        self.assertEqual(mn.regulators("b"), {"a", "b"})
+        with self.assertRaises(minibn.ParseError) as cm:
+            minibn.MultiValuedNetwork("a:1 <- b\nb:1 <- (a\n")
+        self.assertEqual(cm.exception.lineno, 2)
+
+    def test_shared_algebra(self):
+        import pickle
+        bn = bn2()
+        mutant = minibn.BooleanNetwork({"a": "!b & c", "b": "0", "c": "c"},
+                                        ba=bn.ba)
+        self.assertIs(mutant["a"], bn["a"])
+        self.assertIs(mutant.v("c"), bn.v("c"))
+        self.assertIs(mutant["b"], bn["d"])
+        bns = pickle.loads(pickle.dumps([bn, mutant]))
+        self.assertIs(bns[0].ba, bns[1].ba)
+        self.assertEqual(bns, [bn, mutant])
+        with self.assertRaises(TypeError):
+            minibn.MultiValuedNetwork(ba=bn.ba)
+
+    def test_overlay(self):
+        bn = bn2()
+        bn.compile()
+        ov = bn.overlay(c="0")
+        mutant = bn.copy()
+        mutant["c"] = "0"
+        self.assertEqual(ov, mutant)
+        self.assertEqual(ov.source(), mutant.source())
+        self.assertEqual(ov.make_hash(), mutant.make_hash())
+        self.assertEqual(ov.targets("c"), {"a", "b"})
+        for x in all_states(bn):
+            self.assertEqual(ov(x), mutant(x))
+        self.assertEqual(set(ov.dynamics("asynchronous").edges()),
+                         set(mutant.dynamics("asynchronous").edges()))
+        bn["a"] = "c"
+        self.assertEqual(ov.targets("c"), {"a", "b"})
+        self.assertEqual(ov["a"], mutant["a"])
+
+    def test_screen_perturbations(self):
+        bn = bn2()
+        perturbations = [{}, {"c": 1}, {"a": 1, "b": 0}]
+        df = minibn.screen_perturbations(bn, perturbations)
+        self.assertEqual(list(df.index), ["wild-type", "c=1", "a=1,b=0", "a=1,b=0"])
+        self.assertEqual(df.loc["wild-type"].to_dict(),
+                         {"a": 0, "b": 1, "c": 0, "d": 0})
+        self.assertTrue(df.loc["c=1"].isna().all())
+        dfp = minibn.screen_perturbations(bn, perturbations, "attractors",
+                                          processes=2)
+        self.assertEqual(len(dfp.loc["wild-type"]), 2)
+        self.assertEqual(dfp.loc["c=1", "a"], "*")
+        self.assertEqual(bn, bn2())
+
+    def test_simplify(self):
+        bn = minibn.BooleanNetwork({"a": "b & !b | c", "b": "a & !c | a & c",
+                                    "c": "c | c & b"})
+        s = bn.simplify()
+        self.assertEqual(s.source(), "a, c\nb, a\nc, c\n")
+        other = minibn.BooleanNetwork({"z": "a & !c | a & c"})
+        self.assertIs(other.simplify()["z"], other.ba.symbols("a")[0])
+        minibn._simplified.clear()
+        self.assertEqual(bn.simplify(processes=2, timeout=10), s)
+        self.assertRaises(ValueError, bn.simplify, timeout=10)
+        bn = minibn.BooleanNetwork({"x": "a | (b & (c | (d & e)))"})
+        other = bn.copy()
+        bn.simplify(in_place=True)
+        other.simplify(in_place=True)
+        other.make_hash()
+        self.assertEqual(bn.source(), "x, a|(b&(c|(d&e)))\n")
+
+    def test_hash(self):
+        bn = bn2()
+        h = bn.make_hash()
+        self.assertEqual(bn.make_hash(), h)
+        bn2_ = bn.copy()
+        bn2_["d"] = "1"
+        self.assertNotEqual(bn2_.make_hash(), h)
+        bn2_["d"] = "0"
+        self.assertEqual(bn2_.make_hash(), h)
+        self.assertEqual(minibn.BooleanNetwork({"a": "b|c", "b": "b", "c": "1"}).make_hash(),
+                minibn.BooleanNetwork({"c": "1", "b": "b", "a": "c|b"}).make_hash())
+
+class TestRuns(unittest.TestCase):
+    def test_ensemble(self):
+        bn = bn2()
+        init = {"a": 0, "b": 0, "c": 1, "d": 0}
+        runs = minibn.SyncEnsembleRun(bn, init, 3, trajectories=5)
+        T = runs.trajectories()
+        self.assertEqual(T.shape, (5, 4, 4))
+        self.assertEqual(T[0].tolist(),
+            [list(x.values()) for x in minibn.SyncRun(bn, init, 3)])
+        bn["d"] = "!d"
+        for cls in [minibn.FAsyncEnsembleRun, minibn.GAsyncEnsembleRun]:
+            occ = cls(bn, init, 10, trajectories=100).occupancy()
+            self.assertEqual(occ.shape, (11, 4))
+            self.assertTrue((occ["c"] == 1).all())
+            T1 = cls(bn, init, 10, trajectories=100, seed=0).trajectories()
+            T2 = cls(bn, init, 10, trajectories=100, seed=0).trajectories()
+            self.assertTrue((T1 == T2).all())
+
+class TestMultiValued(unittest.TestCase):
+    def test_dynamics(self):
+        mn = minibn.MultiValuedNetwork("a:1 <- !b:2\na:2 <- !b\nb:1 <- a:1\nb:2 <- a:2\n")
+        self.assertEqual(mn.max_levels(), {"a": 2, "b": 2})
+        self.assertEqual(mn({"a": 0, "b": 0}), {"a": 2, "b": 0})
+        self.assertEqual(mn({"a": 2, "b": 1}), {"a": 1, "b": 2})
+        d = mn.dynamics("asynchronous")
+        self.assertEqual(len(d), 9)
+        self.assertEqual(set(d.successors("00")), {"10"})
+        self.assertEqual(set(d.successors("21")), {"11", "22"})
+        g = mn.dynamics("general", backend="csr")
+        self.assertEqual(set(g.to_networkx().successors("21")), {"11", "22", "12"})
+        self.assertEqual(set(mn.dynamics("synchronous").successors("21")), {"12"})
+        attractors = mn.attractors()
+        self.assertEqual(len(attractors), 1)
+        self.assertEqual(attractors, g.attractors())
+        run = list(minibn.SyncRun(mn, {"a": 0, "b": 0}, 3))
+        self.assertEqual(run[:3], [{"a": 0, "b": 0}, {"a": 1, "b": 0},
+                                   {"a": 2, "b": 1}])
+        mn = minibn.MultiValuedNetwork("a:1 <- b\nb:1 <- a\nb:12 <- a & b:3\n")
+        d = mn.dynamics("asynchronous")
+        self.assertEqual(set(d.successors("111")), {"112"})
+        self.assertEqual(set(mn.dynamics("asynchronous", backend="csr")
+                                .to_networkx().nodes()), set(d.nodes()))